@@ -0,0 +1,336 @@
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chatbot.sketch import QuantileSketch
+
+
+class ExactSum:
+    """Running sum of ints and floats without rounding.
+
+    Every float is an int over a power of two, so the total is kept as an
+    int numerator over ``2 ** shift``. ``mean`` divides once at the end and
+    int / int division is correctly rounded, so results equal
+    ``statistics.mean`` however the sum was split, merged or reordered.
+    """
+
+    __slots__ = ("num", "shift", "floats")
+
+    def __init__(self, num: int = 0, shift: int = 0, floats: bool = False):
+        self.num = num
+        self.shift = shift
+        self.floats = floats
+
+    def _align(self, shift: int) -> None:
+        if shift > self.shift:
+            self.num <<= shift - self.shift
+            self.shift = shift
+
+    def add(self, value: float, times: int = 1) -> None:
+        if isinstance(value, int):
+            self.num += (value * times) << self.shift
+            return
+        n, d = float(value).as_integer_ratio()
+        k = d.bit_length() - 1
+        self._align(k)
+        self.num += (n * times) << (self.shift - k)
+        self.floats = True
+
+    def __iadd__(self, other: Any) -> "ExactSum":
+        if not isinstance(other, ExactSum):
+            self.add(other)
+            return self
+        self._align(other.shift)
+        self.num += other.num << (self.shift - other.shift)
+        self.floats = self.floats or other.floats
+        return self
+
+    def __add__(self, other: Any) -> "ExactSum":
+        out = ExactSum(self.num, self.shift, self.floats)
+        out += other
+        return out
+
+    def __sub__(self, other: "ExactSum") -> "ExactSum":
+        out = ExactSum(self.num, self.shift, self.floats or other.floats)
+        out._align(other.shift)
+        out.num -= other.num << (out.shift - other.shift)
+        return out
+
+    def __float__(self) -> float:
+        return self.num / (1 << self.shift)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ExactSum):
+            return self.num << other.shift == other.num << self.shift
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ExactSum({float(self)!r})"
+
+    def mean(self, count: int) -> float:
+        # Same value/type as statistics.mean: exact int averages of ints stay int.
+        if not count:
+            return 0.0
+        den = count << self.shift
+        if not self.floats and self.num % den == 0:
+            return self.num // den
+        return self.num / den
+
+
+def _round(value: Optional[float], ndigits: int) -> Optional[float]:
+    return None if value is None else round(value, ndigits)
+
+
+def nps_bucket(rating: float) -> int:
+    # NPS from 0-10 scale, approximate from 1-5 by *2 and clamp
+    x = int(round(min(10, max(0, rating * 2))))
+    if x >= 9:
+        return 1
+    if x <= 6:
+        return -1
+    return 0
+
+
+class LearnerStats:
+    __slots__ = ("present", "total", "score_sum", "score_count", "rating_sum", "rating_count")
+
+    def __init__(self):
+        self.present = 0
+        self.total = 0
+        self.score_sum = ExactSum()
+        self.score_count = 0
+        self.rating_sum = ExactSum()
+        self.rating_count = 0
+
+    @property
+    def attendance(self) -> float:
+        return (self.present / self.total) if self.total else 0.0
+
+    @property
+    def score(self) -> float:
+        return self.score_sum.mean(self.score_count)
+
+    @property
+    def satisfaction(self) -> float:
+        return self.rating_sum.mean(self.rating_count)
+
+    @property
+    def completed(self) -> bool:
+        # Completion proxy: avg score >= 60 and attendance >= 70%
+        return self.attendance >= 0.7 and self.score >= 60
+
+    @property
+    def risk(self) -> float:
+        # Simple weighted score: low attendance (w=0.5), low score (w=0.3), low satisfaction (w=0.2)
+        return (1 - self.attendance) * 0.5 + (max(0, (60 - self.score)) / 60) * 0.3 + (max(0, (3.5 - self.satisfaction)) / 3.5) * 0.2
+
+    @property
+    def active(self) -> bool:
+        return bool(self.total or self.score_count or self.rating_count)
+
+    @property
+    def window_risk(self) -> float:
+        # ``risk`` for a date window: a metric with no rows there adds nothing instead of counting as 0.
+        risk = 0.0
+        if self.total:
+            risk += (1 - self.attendance) * 0.5
+        if self.score_count:
+            risk += (max(0, (60 - self.score)) / 60) * 0.3
+        if self.rating_count:
+            risk += (max(0, (3.5 - self.satisfaction)) / 3.5) * 0.2
+        return risk
+
+    def merge(self, other: "LearnerStats") -> None:
+        self.present += other.present
+        self.total += other.total
+        self.score_sum += other.score_sum
+        self.score_count += other.score_count
+        self.rating_sum += other.rating_sum
+        self.rating_count += other.rating_count
+
+    def detail(self) -> Dict[str, Any]:
+        return {"attendance": round(self.attendance, 2), "score": round(self.score, 1), "satisfaction": round(self.satisfaction, 2)}
+
+
+class Aggregate:
+    """Per-learner and cohort-level counters built in one pass over the event rows.
+
+    KPI card, completion proxy and risk scores are all read from the same
+    counters, so a report computes each number exactly once.
+    """
+
+    def __init__(self, cohort_ids: Iterable[str] = ()):
+        self.cohort_ids = set(cohort_ids)
+        self.roster: Dict[str, LearnerStats] = {}
+        self.learners: Dict[str, LearnerStats] = {}
+        self.att_present = 0
+        self.att_total = 0
+        self.submitted = 0
+        self.assess_total = 0
+        self.quiz_sum = ExactSum()
+        self.quiz_count = 0
+        self.rating_sum = ExactSum()
+        self.rating_count = 0
+        self.promoters = 0
+        self.detractors = 0
+        self.completed = 0
+        # Score distributions for p10/p50/p90; they merge like the counters.
+        self.quiz_sketch = QuantileSketch()
+        self.rating_sketch = QuantileSketch()
+        self.window = False
+
+    def stats(self, learner_id: str) -> LearnerStats:
+        st = self.learners.get(learner_id)
+        if st is None:
+            st = self.learners[learner_id] = LearnerStats()
+        return st
+
+    def _track(self, learner_id: str, st: LearnerStats, was_completed: bool) -> None:
+        # Keep the completion count current in O(1) as rows arrive.
+        if learner_id in self.roster and st.completed != was_completed:
+            self.completed += 1 if not was_completed else -1
+
+    def add_learner(self, learner: dict) -> None:
+        lid = learner["id"]
+        if lid in self.roster:
+            return
+        st = self.roster[lid] = self.stats(lid)
+        if st.completed:
+            self.completed += 1
+
+    def add_attendance(self, row: dict) -> None:
+        lid = row["learner_id"]
+        st = self.stats(lid)
+        was_completed = st.completed
+        st.total += 1
+        self.att_total += 1
+        if row.get("status") == "present":
+            st.present += 1
+            self.att_present += 1
+        self._track(lid, st, was_completed)
+
+    def add_assessment(self, row: dict) -> None:
+        lid = row["learner_id"]
+        st = self.stats(lid)
+        was_completed = st.completed
+        score = row["score"]
+        st.score_sum.add(score)
+        st.score_count += 1
+        self._track(lid, st, was_completed)
+        self.assess_total += 1
+        if row.get("submitted", False):
+            self.submitted += 1
+        if row.get("type") == "quiz":
+            self.quiz_sum.add(score)
+            self.quiz_count += 1
+            self.quiz_sketch.add(score)
+
+    def add_satisfaction(self, row: dict) -> None:
+        st = self.stats(row["learner_id"])
+        rating = row["rating"]
+        st.rating_sum.add(rating)
+        st.rating_count += 1
+        self.rating_sum.add(rating)
+        self.rating_count += 1
+        self.rating_sketch.add(rating)
+        bucket = nps_bucket(rating)
+        if bucket > 0:
+            self.promoters += 1
+        elif bucket < 0:
+            self.detractors += 1
+
+    def merge(self, other: "Aggregate", recount: bool = True) -> "Aggregate":
+        self.cohort_ids |= other.cohort_ids
+        for lid, st in other.learners.items():
+            self.stats(lid).merge(st)
+        for lid in other.roster:
+            self.roster[lid] = self.learners[lid]
+        for name in ("att_present", "att_total", "submitted", "assess_total", "quiz_count", "rating_count", "promoters", "detractors"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.quiz_sum += other.quiz_sum
+        self.rating_sum += other.rating_sum
+        self.quiz_sketch.merge(other.quiz_sketch)
+        self.rating_sketch.merge(other.rating_sketch)
+        # Learners may span merged parts, so flags are re-derived from the summed stats; callers
+        # merging many parts pass recount=False and recount once at the end.
+        return self.recount() if recount else self
+
+    def recount(self) -> "Aggregate":
+        self.completed = sum(1 for st in self.roster.values() if st.completed)
+        return self
+
+    def windowed(self) -> "Aggregate":
+        """Treat this aggregate as a date window, in place.
+
+        Learners with no rows in the window leave the roster, so they are
+        neither ranked nor counted for completion. A KPI with no rows behind
+        it reads as None (no data) rather than 0, and learner risk skips
+        metrics the learner has no rows for.
+        """
+        self.window = True
+        self.roster = {lid: st for lid, st in self.roster.items() if st.active}
+        return self.recount()
+
+    def kpis(self) -> Dict[str, Any]:
+        # Whole-history reports keep 0 for an empty metric; windows report None.
+        empty = None if self.window else 0.0
+        attendance_rate = (self.att_present / self.att_total) if self.att_total else empty
+        assignment_completion_rate = (self.submitted / self.assess_total) if self.assess_total else empty
+        quiz_avg = self.quiz_sum.mean(self.quiz_count) if self.quiz_count else empty
+        completion_rate = (self.completed / len(self.roster)) if self.roster else empty
+        satisfaction_avg = self.rating_sum.mean(self.rating_count) if self.rating_count else empty
+        nps = ((self.promoters - self.detractors) / self.rating_count) * 100.0 if self.rating_count else empty
+        return {
+            "attendance_rate": _round(attendance_rate, 3),
+            "assignment_completion_rate": _round(assignment_completion_rate, 3),
+            "quiz_avg": _round(quiz_avg, 1),
+            "completion_rate": _round(completion_rate, 3),
+            "satisfaction_avg": _round(satisfaction_avg, 2),
+            "nps": _round(nps, 1),
+            "quiz_percentiles": self.quiz_sketch.percentiles(),
+            "satisfaction_percentiles": self.rating_sketch.percentiles(),
+            "cohorts": sorted(self.cohort_ids),
+        }
+
+    def risk_items(self) -> Iterator[Tuple[str, float, LearnerStats]]:
+        if self.window:
+            return ((lid, round(st.window_risk, 3), st) for lid, st in self.roster.items())
+        return ((lid, round(st.risk, 3), st) for lid, st in self.roster.items())
+
+    def top_risks(self, k: int, min_risk: Optional[float] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
+        return top_k_risks(self.risk_items(), k, min_risk)
+
+    def risks(self) -> List[Tuple[str, float, Dict[str, Any]]]:
+        out = [(lid, r, st.detail()) for lid, r, st in self.risk_items()]
+        out.sort(key=lambda x: x[1], reverse=True)
+        return out
+
+
+def top_k_risks(items: Iterable[Tuple[Any, ...]], k: int, min_risk: Optional[float] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
+    """Bounded-heap top-k over (learner_id, risk, stats[, extra detail]) items.
+
+    Same order as a full stable sort by risk, but only the k returned
+    learners get a detail dict. ``min_risk`` drops items below the cut-off.
+    """
+    if min_risk is not None:
+        items = (x for x in items if x[1] >= min_risk)
+    out = []
+    for item in heapq.nlargest(max(0, k), items, key=lambda x: x[1]):
+        detail = item[2].detail()
+        if len(item) > 3:
+            detail.update(item[3])
+        out.append((item[0], item[1], detail))
+    return out
+
+
+def build_aggregate(store: Any, cohort_ids: Iterable[str]) -> Aggregate:
+    cohort_ids = list(cohort_ids)
+    agg = Aggregate(cohort_ids)
+    for l in store.learners(cohort_ids):
+        agg.add_learner(l)
+    for r in store.rows("attendance", cohort_ids):
+        agg.add_attendance(r)
+    for r in store.rows("assessments", cohort_ids):
+        agg.add_assessment(r)
+    for r in store.rows("satisfaction", cohort_ids):
+        agg.add_satisfaction(r)
+    return agg
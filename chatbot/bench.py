@@ -0,0 +1,151 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from chatbot.core import compute_kpis, compute_kpis_grouped, generate_aar, load_data, recommend_modules, risk_scores, top_risks, weekly_report
+from chatbot.store import EVENT_TABLES, OpsStore
+from chatbot.synth import write_dataset
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+SCALES = (10_000, 100_000, 1_000_000, 10_000_000)
+LEARNERS_PER_COHORT = 50
+EVENTS_PER_LEARNER = 20
+COHORTS_PER_COMPANY = 20
+
+
+def dataset_shape(events: int, seed: int = 0) -> Dict[str, int]:
+    cohorts = max(1, events // (LEARNERS_PER_COHORT * EVENTS_PER_LEARNER))
+    companies = max(1, cohorts // COHORTS_PER_COMPANY)
+    return {
+        "companies": companies,
+        "cohorts_per_company": max(1, cohorts // companies),
+        "learners_per_cohort": LEARNERS_PER_COHORT,
+        "events_per_learner": EVENTS_PER_LEARNER,
+        "modules": min(5000, max(50, events // 200)),
+        "seed": seed,
+    }
+
+
+def _measure(fn: Callable[[], Any], repeat: int, memory: bool) -> Dict[str, Any]:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    out: Dict[str, Any] = {"seconds": statistics.median(times), "min_seconds": min(times)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        out["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return out
+
+
+def run_scale(events: int, repeat: int = 3, memory: bool = True, seed: int = 0, workdir: Optional[str] = None) -> Dict[str, Any]:
+    """Benchmark one scale the way the CLI runs it: a seed JSON file on disk, loaded, indexed, queried.
+
+    The file is written with the streaming writer, so generating it never holds the dataset in
+    memory; only ``load_data`` (timed) does.
+    """
+    shape = dataset_shape(events, seed)
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        path = os.path.join(tmp, f"bench_{events}.json")
+        t0 = time.perf_counter()
+        counts = write_dataset(path, **shape)
+        write_seconds = time.perf_counter() - t0
+        file_bytes = os.path.getsize(path)
+        load = _measure(lambda: load_data(path), 1, memory)
+        data = load_data(path)
+    n_events = sum(counts[t] for t in EVENT_TABLES)
+
+    index = _measure(lambda: OpsStore(data), 1, memory)
+    store = OpsStore(data)
+    cohort = store["cohorts"][0]
+    cid, company = cohort["id"], cohort["company_id"]
+    cohort_events = sum(len(store.by_cohort[t].get(cid, [])) for t in EVENT_TABLES)
+    learner = store["learners"][0]
+
+    cases: List[Any] = [
+        ("compute_kpis[all]", lambda: compute_kpis(store), n_events),
+        ("compute_kpis[cohort]", lambda: compute_kpis(store, cohort_id=cid), cohort_events),
+        ("compute_kpis[cohort,unindexed]", lambda: compute_kpis(data, cohort_id=cid), n_events),
+        ("compute_kpis_grouped[cohort]", lambda: compute_kpis_grouped(store, "cohort"), n_events),
+        ("risk_scores[cohort]", lambda: risk_scores(store, cid), cohort_events),
+        ("top_risks[all,k=50]", lambda: top_risks(store, 50), n_events),
+        ("weekly_report", lambda: weekly_report(store, company, cid), cohort_events),
+        ("generate_aar", lambda: generate_aar(store, cid), cohort_events),
+        ("recommend_modules", lambda: recommend_modules(store, learner["role"], learner["level"], 4, ["data", "sql"]), len(store["modules"])),
+    ]
+    results = []
+    for name, fn, touched in cases:
+        m = _measure(fn, repeat, memory)
+        m["name"] = name
+        m["rows"] = touched
+        m["ops_per_sec"] = (1.0 / m["seconds"]) if m["seconds"] else None
+        m["rows_per_sec"] = (touched / m["seconds"]) if m["seconds"] else None
+        results.append(m)
+    return {
+        "events": n_events,
+        "shape": shape,
+        "write_seconds": write_seconds,
+        "file_bytes": file_bytes,
+        "load_seconds": load["seconds"],
+        "load_peak_bytes": load.get("peak_bytes"),
+        "index_seconds": index["seconds"],
+        "index_peak_bytes": index.get("peak_bytes"),
+        "results": results,
+    }
+
+
+def run(scales: List[int], repeat: int = 3, memory: bool = True, seed: int = 0, workdir: Optional[str] = None) -> Dict[str, Any]:
+    report: Dict[str, Any] = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "scales": [],
+    }
+    for events in scales:
+        report["scales"].append(run_scale(events, repeat=repeat, memory=memory, seed=seed, workdir=workdir))
+        gc.collect()
+    if resource is not None:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        report["max_rss_bytes"] = rss if sys.platform == "darwin" else rss * 1024
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chatbot.core on synthetic data; prints JSON")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(SCALES), help="Event counts to benchmark (default: 10k 100k 1M 10M)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip tracemalloc peak-memory runs (much faster at large scales)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default=None, help="Write JSON here instead of stdout")
+    parser.add_argument("--workdir", default=None, help="Directory for the generated dataset files (default: system temp; removed after each scale)")
+    args = parser.parse_args(argv)
+    report = run(args.scales, repeat=args.repeat, memory=args.memory, seed=args.seed, workdir=args.workdir)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS briefs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, created_at TEXT, industry TEXT, role TEXT, level TEXT,
+    size INTEGER, duration_days INTEGER, doc TEXT, digest TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_briefs_profile ON briefs(industry, role, level);
+"""
+
+# Score weights: exact profile matches dominate, then goal overlap, then size/duration closeness.
+WEIGHTS = {"industry": 3.0, "role": 3.0, "level": 2.0, "terms": 2.0, "size": 1.0, "duration": 1.0}
+_FEATURE_MAX = WEIGHTS["terms"] + WEIGHTS["size"] + WEIGHTS["duration"]
+_UNITS = {"일": 1, "주": 7, "개월": 30, "달": 30, "d": 1, "w": 7}
+_TOKEN = re.compile(r"[0-9a-z가-힣%]+")
+
+
+def duration_days(value: Any) -> Optional[int]:
+    """'4주' -> 28, '2일' -> 2, '3개월' -> 90; plain numbers are days."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    m = re.match(r"\s*(\d+(?:\.\d+)?)\s*(개월|달|일|주|d|w)?", str(value).lower())
+    if not m:
+        return None
+    return int(round(float(m.group(1)) * _UNITS.get(m.group(2) or "일", 1)))
+
+
+def brief_digest(brief: Dict[str, Any]) -> str:
+    """Content hash of a brief (key order does not matter); equal briefs share it."""
+    return hashlib.sha1(json.dumps(brief, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def goal_terms(text: Optional[str]) -> FrozenSet[str]:
+    """Lower-cased word tokens of the goals text (2+ characters, or a number with %)."""
+    return frozenset(t for t in _TOKEN.findall((text or "").lower()) if len(t) > 1)
+
+
+class BriefStore:
+    """Briefs persisted in SQLite: profile and size/duration columns plus the full brief as JSON.
+
+    Each row carries a content digest, so saving the same brief again returns
+    the existing id instead of adding a duplicate.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self._migrate()
+
+    def _migrate(self) -> None:
+        # Stores created before briefs were deduplicated: add and backfill the digest column.
+        if "digest" not in {r[1] for r in self.conn.execute("PRAGMA table_info(briefs)")}:
+            with self.conn:
+                self.conn.execute("ALTER TABLE briefs ADD COLUMN digest TEXT")
+                self.conn.executemany(
+                    "UPDATE briefs SET digest = ? WHERE id = ?",
+                    [(brief_digest(json.loads(doc)), brief_id) for brief_id, doc in self.conn.execute("SELECT id, doc FROM briefs")],
+                )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_briefs_digest ON briefs(digest)")
+
+    def add(self, brief: Dict[str, Any]) -> int:
+        digest = brief_digest(brief)
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT MIN(id) FROM briefs WHERE digest = ?", (digest,)).fetchone()
+            if row[0] is not None:
+                return row[0]
+            cur = self.conn.execute(
+                "INSERT INTO briefs (created_at, industry, role, level, size, duration_days, doc, digest) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    datetime.now().isoformat(timespec="seconds"),
+                    brief.get("industry"),
+                    brief.get("role"),
+                    brief.get("level"),
+                    brief.get("size"),
+                    duration_days(brief.get("duration")),
+                    json.dumps(brief, ensure_ascii=False),
+                    digest,
+                ),
+            )
+        return cur.lastrowid
+
+    def row(self, brief_id: int) -> Optional[Tuple[int, str, Dict[str, Any]]]:
+        row = self.conn.execute("SELECT id, created_at, doc FROM briefs WHERE id = ?", (brief_id,)).fetchone()
+        return (row[0], row[1], json.loads(row[2])) if row else None
+
+    def rows(self) -> Iterable[Tuple[int, str, Dict[str, Any]]]:
+        for brief_id, created_at, doc in self.conn.execute("SELECT id, created_at, doc FROM briefs ORDER BY id"):
+            yield brief_id, created_at, json.loads(doc)
+
+    def version(self) -> Tuple[int, int]:
+        return tuple(self.conn.execute("SELECT COALESCE(MAX(id), 0), COUNT(*) FROM briefs").fetchone())
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class BriefIndex:
+    """Precomputed features of stored briefs for nearest-brief lookup.
+
+    Briefs are grouped by (industry, role, level), with log size, log
+    duration and goal terms kept per brief. Since a group's profile score is
+    the same for all its members and the other features add at most
+    ``_FEATURE_MAX``, a query visits groups best profile first and stops
+    once no remaining group can beat the current top k, so it usually scores
+    only its own group rather than the whole store. ``add`` keeps the index
+    current without a rebuild. Briefs with the same content as the query
+    (earlier saves of it) are never returned as similar.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[int, str, Dict[str, Any]]] = ()):
+        self.briefs: Dict[int, Dict[str, Any]] = {}
+        self.created: Dict[int, str] = {}
+        self.digests: Dict[int, str] = {}
+        self.groups: Dict[Tuple[Any, Any, Any], Dict[int, Tuple[Optional[float], Optional[float], FrozenSet[str]]]] = defaultdict(dict)
+        for brief_id, created_at, brief in rows:
+            self.add(brief_id, created_at, brief)
+
+    @staticmethod
+    def _features(brief: Dict[str, Any]) -> Tuple[Tuple[Any, Any, Any], Tuple[Optional[float], Optional[float], FrozenSet[str]]]:
+        size = brief.get("size")
+        days = duration_days(brief.get("duration"))
+        return (brief.get("industry"), brief.get("role"), brief.get("level")), (
+            math.log(size) if size and size > 0 else None,
+            math.log(days) if days and days > 0 else None,
+            goal_terms(brief.get("goals")),
+        )
+
+    def add(self, brief_id: int, created_at: str, brief: Dict[str, Any]) -> None:
+        profile, features = self._features(brief)
+        self.groups[profile][brief_id] = features
+        self.briefs[brief_id] = brief
+        self.created[brief_id] = created_at
+        self.digests[brief_id] = brief_digest(brief)
+
+    def __len__(self) -> int:
+        return len(self.briefs)
+
+    @staticmethod
+    def _profile_score(q: Tuple[Any, ...], p: Tuple[Any, ...]) -> float:
+        return sum(WEIGHTS[name] for name, a, b in zip(("industry", "role", "level"), q, p) if a is not None and a == b)
+
+    @staticmethod
+    def _feature_score(q: Tuple[Any, ...], f: Tuple[Any, ...]) -> float:
+        score = 0.0
+        for name, a, b in (("size", q[0], f[0]), ("duration", q[1], f[1])):
+            if a is not None and b is not None:
+                # 1 for equal, 0.5 at double/half, shrinking with the log ratio.
+                score += WEIGHTS[name] / (1 + abs(a - b) / math.log(2))
+        if q[2] and f[2]:
+            score += WEIGHTS["terms"] * len(q[2] & f[2]) / len(q[2] | f[2])
+        return score
+
+    def similar(self, brief: Dict[str, Any], k: int = 3, exclude: Iterable[int] = ()) -> List[Dict[str, Any]]:
+        """Top-k stored briefs by similarity: {"id", "score", "created_at", "brief", "shared_terms"}."""
+        profile, q = self._features(brief)
+        skip = set(exclude)
+        digest = brief_digest(brief)
+        top: List[Tuple[float, int]] = []  # min-heap of the best k so far
+        for base, key in sorted(((self._profile_score(profile, p), p) for p in self.groups), reverse=True):
+            if len(top) == k and base + _FEATURE_MAX <= top[0][0]:
+                break
+            for i, f in self.groups[key].items():
+                if i in skip or self.digests[i] == digest:
+                    continue
+                item = (base + self._feature_score(q, f), i)
+                if len(top) < k:
+                    heapq.heappush(top, item)
+                elif item > top[0]:
+                    heapq.heapreplace(top, item)
+        return [
+            {"id": i, "score": round(s, 2), "created_at": self.created[i], "brief": self.briefs[i], "shared_terms": sorted(q[2] & goal_terms(self.briefs[i].get("goals")))}
+            for s, i in sorted(top, reverse=True)
+        ]
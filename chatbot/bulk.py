@@ -0,0 +1,79 @@
+import multiprocessing as mp
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, Optional, Tuple
+
+from chatbot import trace
+from chatbot.core import generate_aar, weekly_report
+from chatbot.store import as_store
+
+
+# Read-only dataset shared with workers: inherited on fork, sent once per worker otherwise.
+_DATA: Any = None
+
+
+def _init_worker(data: Any = None) -> None:
+    global _DATA
+    # Spans recorded in a worker would never reach the parent's tracer.
+    trace.disable()
+    if data is not None:
+        _DATA = data
+
+
+def _safe_name(s: str) -> str:
+    return re.sub(r"[^0-9A-Za-z_.-]+", "_", s)
+
+
+def _render(task: Tuple[str, str, str, str, Optional[int]]) -> str:
+    kind, company_id, cohort_id, out_dir, week = task
+    if kind == "weekly":
+        text = weekly_report(_DATA, company_id, cohort_id, week=week)
+    else:
+        text = generate_aar(_DATA, cohort_id)
+    suffix = f"_w{week}" if week is not None and kind == "weekly" else ""
+    path = os.path.join(out_dir, f"{kind}_{_safe_name(cohort_id)}{suffix}.txt")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text + "\n")
+    return path
+
+
+def generate_all(data: Any, kind: str, out_dir: str, company_id: Optional[str] = None, workers: Optional[int] = None, week: Optional[int] = None) -> List[str]:
+    """Write a weekly report or AAR per cohort, one file each, using a process pool.
+
+    ``week`` limits weekly reports to that week of each cohort; cohorts
+    without ``start_at`` have no weeks and are skipped with a message.
+    """
+    global _DATA
+    if kind not in ("weekly", "aar"):
+        raise ValueError(f"kind must be 'weekly' or 'aar', got {kind!r}")
+    store = as_store(data)
+    os.makedirs(out_dir, exist_ok=True)
+    tasks = []
+    for cid in store.select_cohorts(company_id=company_id):
+        cohort = store.cohorts_by_id[cid]
+        if kind == "weekly" and week is not None and not cohort.get("start_at"):
+            print(f"건너뜀: {cid} (start_at 없음, --week 계산 불가)", file=sys.stderr)
+            continue
+        tasks.append((kind, str(cohort.get("company_id")), cid, out_dir, week))
+    if not tasks:
+        return []
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    try:
+        if workers == 1:
+            _DATA = store
+            return [_render(t) for t in tasks]
+
+        if "fork" in mp.get_all_start_methods():
+            # Children inherit the parent's memory, so the store is never pickled.
+            _DATA = store
+            ctx, initargs = mp.get_context("fork"), ()
+        else:
+            ctx, initargs = mp.get_context(), (store,)
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=initargs) as pool:
+            return list(pool.map(_render, tasks, chunksize=chunksize))
+    finally:
+        # Don't keep the whole store alive in this module once the reports are written.
+        _DATA = None
@@ -0,0 +1,412 @@
+import functools
+import hashlib
+import heapq
+import json
+import math
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+
+PM_ROLES = ("pm", "product manager")
+# Solver works in half-hour units so fractional durations stay exact enough.
+UNITS_PER_HOUR = 2
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._items: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Any:
+        if key in self._items:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return self._items[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Any, value: Any) -> None:
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self.hits = self.misses = 0
+
+
+# Recommendation results keyed on (catalog version, normalized query); shared by all catalogs
+# in the process, so a reloaded catalog with new content never sees stale entries.
+RESULT_CACHE = LRUCache(maxsize=4096)
+
+
+def _forest_knapsack(nodes: List[Tuple[int, int, int]], capacity: int) -> List[int]:
+    """0/1 knapsack over a forest given in DFS preorder; returns chosen positions.
+
+    ``nodes`` are (value, weight, subtree size). Skipping a node skips its
+    whole subtree, so a node can only be taken together with its parent;
+    plain items are subtrees of size 1. One list-comprehension row per node
+    keeps it O(n * capacity) at C speed.
+    """
+    n = len(nodes)
+    rows: List[List[int]] = [[]] * n + [[0] * (capacity + 1)]
+    for pos in range(n - 1, -1, -1):
+        value, weight, size = nodes[pos]
+        skip = rows[pos + size]
+        if weight > capacity:
+            rows[pos] = skip
+            continue
+        rows[pos] = skip[:weight] + [t + value if t + value > s else s for t, s in zip(rows[pos + 1], skip[weight:])]
+    chosen = []
+    pos, c = 0, capacity
+    while pos < n:
+        value, weight, size = nodes[pos]
+        if weight <= c and rows[pos + 1][c - weight] + value > rows[pos + size][c]:
+            chosen.append(pos)
+            c -= weight
+            pos += 1
+        else:
+            pos += size
+    return chosen
+
+
+class ModuleCatalog:
+    """Prebuilt index over the module catalog for ``recommend_modules``.
+
+    Tags are lowercased once, and a tag -> modules inverted index plus a
+    level -> modules index mean a query only scores modules that share a tag
+    or the level; everything else scores 0 and only backfills the tail.
+    """
+
+    def __init__(self, modules: List[dict]):
+        self.modules = list(modules)
+        self.tags: List[FrozenSet[str]] = [frozenset(t.lower() for t in m.get("tags", [])) for m in self.modules]
+        self.by_tag: Dict[str, List[int]] = defaultdict(list)
+        self.by_level: Dict[str, List[int]] = defaultdict(list)
+        for i, m in enumerate(self.modules):
+            for t in self.tags[i]:
+                self.by_tag[t].append(i)
+            self.by_level[m.get("level")].append(i)
+        # Solver inputs: durations in half-hour units and prerequisite indexes (unknown ids count as met).
+        ids = {m.get("id"): i for i, m in enumerate(self.modules)}
+        self.units = [max(1, int(math.ceil(m.get("duration_hours", 2) * UNITS_PER_HOUR - 1e-9))) for m in self.modules]
+        self.requires = [list(dict.fromkeys(ids[p] for p in self.prereqs(i) if p in ids)) for i in range(len(self.modules))]
+        self.version = hashlib.sha1(json.dumps(self.modules, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:12]
+
+    def __len__(self) -> int:
+        return len(self.modules)
+
+    def scores(self, role: str, level: str, tags: Optional[List[str]] = None) -> Dict[int, int]:
+        scores: Dict[int, int] = defaultdict(int)
+        for i in self.by_level.get(level, ()):
+            scores[i] += 2
+        for t in {t.lower() for t in (tags or [])}:
+            for i in self.by_tag.get(t, ()):
+                scores[i] += 1
+        if role.lower() in PM_ROLES:
+            for i in self.by_tag.get("pm", ()):
+                scores[i] += 1
+        return scores
+
+    def top(self, scores: Dict[int, int], count: int) -> List[dict]:
+        # Partial selection; ties keep catalog order like the stable full sort did.
+        picked = heapq.nsmallest(count, scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        out = [self.modules[i] for i, _ in picked]
+        if len(out) < count:
+            for i, m in enumerate(self.modules):
+                if len(out) >= count:
+                    break
+                if i not in scores:
+                    out.append(m)
+        return out
+
+    @staticmethod
+    def query_key(role: str, level: str, duration_weeks: int, tags: Optional[List[str]] = None) -> Tuple[Tuple[bool, str, FrozenSet[str]], int]:
+        # Everything the ranking depends on: the role only matters as "is PM",
+        # and weeks only through the module count (2 modules/week, at least 2).
+        scoring = (role.lower() in PM_ROLES, level, frozenset(t.lower() for t in (tags or [])))
+        return scoring, max(2, duration_weeks * 2)
+
+    def _result(self, role: str, level: str, duration_weeks: int, picked: List[dict]) -> Dict[str, Any]:
+        total_hours = sum(m.get("duration_hours", 2) for m in picked)
+        return {"role": role, "level": level, "weeks": duration_weeks, "modules": list(picked), "total_hours": total_hours}
+
+    def recommend(self, role: str, level: str, duration_weeks: int, tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        scoring, count = self.query_key(role, level, duration_weeks, tags)
+        key = (self.version, scoring, count)
+        picked = RESULT_CACHE.get(key)
+        if picked is None:
+            # Pick top N modules proportional to duration (assume 2 modules/week)
+            picked = self.top(self.scores(role, level, tags), count)
+            RESULT_CACHE.put(key, picked)
+        return self._result(role, level, duration_weeks, picked)
+
+    def recommend_batch(self, queries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Recommendations for many (role, level, weeks, tags) queries at once.
+
+        Identical normalized queries are answered once, and queries that
+        differ only in weeks share one candidate scoring pass; only the
+        largest module count per scoring group is selected, and smaller
+        counts are prefixes of it.
+        """
+        parsed = []
+        groups: Dict[Tuple[bool, str, FrozenSet[str]], int] = {}
+        for q in queries:
+            role, level, weeks, tags = q["role"], q["level"], int(q["weeks"]), list(q.get("tags") or [])
+            scoring, count = self.query_key(role, level, weeks, tags)
+            parsed.append((role, level, weeks, tags, scoring, count))
+            if RESULT_CACHE.get((self.version, scoring, count)) is None:
+                groups[scoring] = max(groups.get(scoring, 0), count)
+        for (is_pm, level, tags), count in groups.items():
+            ranked = self.top(self.scores("pm" if is_pm else "", level, list(tags)), count)
+            for role, lvl, weeks, _, scoring, c in parsed:
+                if scoring == (is_pm, level, tags):
+                    RESULT_CACHE.put((self.version, scoring, c), ranked[:c])
+        out = []
+        for role, level, weeks, tags, scoring, count in parsed:
+            picked = RESULT_CACHE.get((self.version, scoring, count))
+            if picked is None:  # evicted mid-batch by a tiny cache
+                picked = self.top(self.scores(role, level, tags), count)
+            out.append(self._result(role, level, weeks, picked))
+        return out
+
+    def prereqs(self, i: int) -> List[str]:
+        m = self.modules[i]
+        return list(m.get("prereqs") or m.get("prerequisites") or [])
+
+    def _closure(self, i: int, deps: Dict[int, List[int]]) -> Set[int]:
+        """``i`` and every module it transitively requires."""
+        out = {i}
+        stack = [i]
+        while stack:
+            for d in deps[stack.pop()]:
+                if d not in out:
+                    out.add(d)
+                    stack.append(d)
+        return out
+
+    def plan(self, role: str, level: str, duration_weeks: int, tags: Optional[List[str]] = None, hours_budget: Optional[float] = None, week_hours: Optional[float] = None, respect_prereqs: bool = True) -> Dict[str, Any]:
+        """Curriculum chosen for total relevance under an hours budget and per-week capacity.
+
+        Candidates are the scored modules plus everything they transitively
+        require, zero-score prerequisites included; modules on a prerequisite
+        cycle or longer than a week can never be planned and are removed with
+        their dependents. Each module hangs under the prerequisite that
+        implies its others, giving a forest solved by one exact knapsack DP on
+        total hours (capacity = min(budget, weeks * week_hours)): a module can
+        only be taken with its prerequisites. Standalone modules with
+        identical (score, hours) are interchangeable and enter as bounded
+        items split 1, 2, 4, ..., which keeps the DP small for large catalogs.
+        A module whose prerequisites do not nest (A and B with neither
+        requiring the other) enters as one item covering its whole closure.
+
+        The set is then packed into weeks first-fit in prerequisite order. If
+        packing drops modules, the freed hours are back-filled greedily by
+        score per hour. ``optimal`` in the result is True only when no module
+        needed the closure item and packing dropped nothing: the DP set is
+        then optimal even ignoring weeks. Otherwise the plan is feasible but
+        a heuristic.
+        """
+        if week_hours is None and hours_budget is None:
+            raise ValueError("plan() needs hours_budget and/or week_hours")
+        weeks = max(1, duration_weeks)
+        total_cap = min(x for x in (hours_budget, None if week_hours is None else week_hours * weeks) if x is not None)
+        capacity = int(math.floor(total_cap * UNITS_PER_HOUR + 1e-9))
+        week_cap = capacity if week_hours is None else int(math.floor(week_hours * UNITS_PER_HOUR + 1e-9))
+        scores = self.scores(role, level, tags)
+        units = self.units
+
+        # Prerequisite closure of the scored modules.
+        deps: Dict[int, List[int]] = {}
+        stack = list(scores)
+        while stack:
+            i = stack.pop()
+            if i not in deps:
+                deps[i] = self.requires[i] if respect_prereqs else []
+                stack.extend(deps[i])
+        users: Dict[int, List[int]] = defaultdict(list)
+        for i, ds in deps.items():
+            for d in ds:
+                users[d].append(i)
+        # Topological order; whatever sits on or behind a cycle never becomes ready.
+        indeg = {i: len(ds) for i, ds in deps.items()}
+        ready = sorted((i for i, k in indeg.items() if k == 0), reverse=True)
+        order: List[int] = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for u in users[i]:
+                indeg[u] -= 1
+                if indeg[u] == 0:
+                    ready.append(u)
+        feasible: Set[int] = set()
+        for i in order:
+            if units[i] <= week_cap and all(d in feasible for d in deps[i]):
+                feasible.add(i)
+        order = [i for i in order if i in feasible]
+
+        exact = True
+        parent: Dict[int, Optional[int]] = {}
+        members: Dict[int, List[int]] = {}
+        for i in order:
+            ds = deps[i]
+            if len(ds) > 1:
+                # The prerequisite whose own closure covers the others is the only one that must be chosen.
+                ds = [d for d in ds if set(ds) <= self._closure(d, deps)][:1]
+                if not ds:
+                    exact = False
+                    parent[i], members[i] = None, sorted(self._closure(i, deps))
+                    continue
+            parent[i], members[i] = (ds[0] if ds else None), [i]
+        value = {i: sum(scores.get(m, 0) for m in members[i]) for i in order}
+        weight = {i: sum(units[m] for m in members[i]) for i in order}
+        subtree = dict(value)
+        for i in reversed(order):
+            if parent[i] is not None:
+                subtree[parent[i]] += subtree[i]
+        # Subtrees scoring nothing only cost hours and are left out.
+        children: Dict[int, List[int]] = defaultdict(list)
+        size = dict.fromkeys(order, 1)
+        for i in reversed(order):
+            if parent[i] is not None and subtree[i]:
+                children[parent[i]].append(i)
+                size[parent[i]] += size[i]
+
+        nodes: List[Tuple[int, int, int]] = []
+        picks: List[List[int]] = []
+        classes: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i in sorted(i for i in order if parent[i] is None and subtree[i]):
+            if not children[i] and members[i] == [i]:
+                classes[(value[i], weight[i])].append(i)
+                continue
+            stack = [i]
+            while stack:
+                j = stack.pop()
+                nodes.append((value[j], weight[j], size[j]))
+                picks.append(members[j])
+                stack.extend(children[j])
+        counted: Dict[int, Tuple[Tuple[int, int], int]] = {}
+        for (v, w), group in classes.items():
+            k, step, done = min(len(group), capacity // w), 1, 0
+            while done < k:
+                n = min(step, k - done)
+                counted[len(nodes)] = ((v, w), n)
+                nodes.append((v * n, w * n, 1))
+                picks.append([])
+                done += n
+                step *= 2
+        # Weights sharing a factor (whole hours are 2 units each) shrink every DP row by it.
+        unit = functools.reduce(math.gcd, (w for _, w, _ in nodes), 0) or 1
+        dp_nodes = [(v, w // unit, n) for v, w, n in nodes]
+        chosen_at = _forest_knapsack(dp_nodes, min(capacity, sum(w for _, w, _ in nodes)) // unit)
+        taken: Dict[Tuple[int, int], int] = defaultdict(int)
+        chosen: Set[int] = set()
+        for pos in chosen_at:
+            if pos in counted:
+                taken[counted[pos][0]] += counted[pos][1]
+            chosen.update(picks[pos])
+        for key, n in taken.items():
+            chosen.update(classes[key][:n])
+
+        schedule, dropped = self._pack(sorted(chosen), weeks, week_cap, deps)
+        if dropped:
+            self._fill(schedule, [i for i in feasible if i in scores and i not in chosen], scores, deps, units, week_cap, capacity)
+
+        picked = [self.modules[i] for week in schedule for i in week]
+        return {
+            "role": role,
+            "level": level,
+            "weeks": duration_weeks,
+            "modules": picked,
+            "total_hours": sum(m.get("duration_hours", 2) for m in picked),
+            "score": sum(scores.get(i, 0) for week in schedule for i in week),
+            "optimal": exact and not dropped,
+            "hours_budget": hours_budget,
+            "week_hours": week_hours,
+            "schedule": [
+                {"week": w + 1, "modules": [self.modules[i].get("id") for i in week], "hours": sum(self.modules[i].get("duration_hours", 2) for i in week)}
+                for w, week in enumerate(schedule)
+            ],
+        }
+
+    @staticmethod
+    def _fill(schedule: List[List[int]], extra: List[int], scores: Dict[int, int], deps: Dict[int, List[int]], units: List[int], week_cap: int, capacity: int) -> None:
+        """Greedy back-fill of hours freed by packing drops, best score per hour first."""
+        week_of = {i: w for w, week in enumerate(schedule) for i in week}
+        load = [sum(units[i] for i in week) for week in schedule]
+        total = sum(load)
+        extra = sorted(extra, key=lambda i: (-scores[i] / units[i], -scores[i], i))
+        added = True
+        while added:
+            added = False
+            for i in extra:
+                if i in week_of or total + units[i] > capacity or any(d not in week_of for d in deps[i]):
+                    continue
+                for w in range(max((week_of[d] for d in deps[i]), default=0), len(schedule)):
+                    if load[w] + units[i] <= week_cap:
+                        schedule[w].append(i)
+                        load[w] += units[i]
+                        total += units[i]
+                        week_of[i] = w
+                        added = True
+                        break
+
+    def _pack(self, chosen: List[int], weeks: int, week_cap: int, deps: Dict[int, List[int]]) -> Tuple[List[List[int]], Set[int]]:
+        # ``chosen`` is closed under ``deps`` and acyclic; modules only drop when no week can hold them.
+        units = self.units
+        # Topological order, larger modules first among those ready (first-fit decreasing).
+        indeg = {i: len(deps[i]) for i in chosen}
+        users: Dict[int, List[int]] = defaultdict(list)
+        for i in chosen:
+            for d in deps[i]:
+                users[d].append(i)
+        ready = [(-units[i], i) for i in chosen if indeg[i] == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            _, i = heapq.heappop(ready)
+            order.append(i)
+            for u in users[i]:
+                indeg[u] -= 1
+                if indeg[u] == 0:
+                    heapq.heappush(ready, (-units[u], u))
+        dropped: Set[int] = set()
+        schedule: List[List[int]] = [[] for _ in range(weeks)]
+        load = [0] * weeks
+        week_of: Dict[int, int] = {}
+        for i in order:
+            if any(d not in week_of for d in deps[i]):
+                dropped.add(i)
+                continue
+            earliest = max((week_of[d] for d in deps[i]), default=0)
+            for w in range(earliest, weeks):
+                if load[w] + units[i] <= week_cap:
+                    schedule[w].append(i)
+                    load[w] += units[i]
+                    week_of[i] = w
+                    break
+            else:
+                dropped.add(i)
+        return schedule, dropped
+
+
+# Catalogs built for plain seed dicts, keyed on id() of their modules list. The entry holds the list
+# itself, so the id cannot be reused while cached; like OpsStore.catalog, modules are not expected to
+# change in place once loaded.
+CATALOG_CACHE = LRUCache(maxsize=8)
+
+
+def get_catalog(data: Any) -> ModuleCatalog:
+    catalog = getattr(data, "catalog", None)
+    if isinstance(catalog, ModuleCatalog):
+        return catalog
+    modules = data["modules"]
+    hit = CATALOG_CACHE.get(id(modules))
+    if hit is not None and hit[0] is modules and hit[1] == len(modules):
+        return hit[2]
+    catalog = ModuleCatalog(modules)
+    CATALOG_CACHE.put(id(modules), (modules, len(modules), catalog))
+    return catalog
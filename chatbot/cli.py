@@ -1,49 +1,262 @@
 import argparse
-from chatbot.core import load_data, compute_kpis, weekly_report, risk_scores, recommend_modules, generate_aar, parse_kv_args
+import csv
+import json
+import re
+import sys
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
 
+from chatbot import trace
+from chatbot.sqlite_store import SqliteStore, import_json, is_sqlite_path
+from chatbot.core import load_data, load_store, compute_kpis, compute_kpis_grouped, compute_kpis_range, compute_kpis_week, weekly_report, top_risks, recommend_modules, recommend_batch, plan_curriculum, generate_aar, parse_kv_args
+from chatbot.timeline import parse_date
 
-def main():
+
+def _add_bulk_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--all", action="store_true", help="Generate for every cohort, one file per cohort")
+    p.add_argument("--out-dir", dest="out_dir", default="reports")
+    p.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+
+
+def _read_batch(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return [
+            {"role": row["role"], "level": row["level"], "weeks": int(row["weeks"]), "tags": [t for t in re.split(r"[\s;|,]+", row.get("tags") or "") if t]}
+            for row in csv.DictReader(f)
+        ]
+
+
+def _print_recommendation(rec: Dict[str, Any], prefix: str = "") -> None:
+    print(f"{prefix}추천 요약: role={rec['role']} level={rec['level']} weeks={rec['weeks']} total_hours={rec['total_hours']}")
+    for m in rec["modules"]:
+        print(f"- {m['id']} | {m['topic']} ({m.get('duration_hours', 2)}h) | tags={','.join(m.get('tags', []))}")
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Training Ops Chatbot (CLI)")
+    parser.add_argument("--engine", choices=["python", "numpy"], default="python", help="KPI/risk engine (numpy: vectorized, for large datasets)")
+    parser.add_argument("--events", action="append", default=None, help="Stream attendance/assessment/satisfaction events from a JSON Lines file, glob or directory; repeatable (seed.json supplies reference tables only)")
+    parser.add_argument("--data", default=None, help="Dataset: seed-format JSON (default chatbot/data/seed.json) or SQLite database (.db/.sqlite)")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help="Parse seed.json instead of using the binary snapshot cache")
+    parser.add_argument("--timings", action="store_true", help="Print wall time per phase (load/filter/aggregate/sort/format) to stderr")
+    parser.add_argument("--profile", action="store_true", help="Like --timings, plus allocated/peak memory per phase (tracemalloc; slower)")
+    parser.add_argument("--trace", default=None, help="Also write the phase spans to this Chrome trace JSON file (chrome://tracing, Perfetto)")
+    parser.add_argument("--connect", default=None, help="Send the command to a running `serve` daemon (host:port or Unix socket path)")
     sub = parser.add_subparsers(dest="cmd")
 
     p_kpi = sub.add_parser("kpi", help="Compute KPIs")
     p_kpi.add_argument("--company", dest="company_id", default=None)
     p_kpi.add_argument("--cohort", dest="cohort_id", default=None)
+    p_kpi.add_argument("--group-by", dest="group_by", choices=["company", "cohort"], default=None, help="KPIs for every company/cohort in one pass")
+    p_kpi.add_argument("--week", type=int, default=None, help="Only the cohort's N-th week (from start_at), with week-over-week deltas; needs --cohort")
+    p_kpi.add_argument("--from", dest="date_from", default=None, help="Only events dated on/after this day (YYYY-MM-DD)")
+    p_kpi.add_argument("--to", dest="date_to", default=None, help="Only events dated on/before this day (YYYY-MM-DD)")
+    p_kpi.add_argument("--where", nargs="+", default=None, metavar="KEY=VALUE", help="Filters: company/cohort/learner/role/level (comma = any of), active_from/active_to (cohort running then)")
 
     p_week = sub.add_parser("weekly", help="Weekly report")
-    p_week.add_argument("--company", dest="company_id", required=True)
-    p_week.add_argument("--cohort", dest="cohort_id", required=True)
+    p_week.add_argument("--company", dest="company_id", default=None)
+    p_week.add_argument("--cohort", dest="cohort_id", default=None)
+    p_week.add_argument("--week", type=int, default=None, help="Report only the cohort's N-th week, with deltas vs the week before")
+    _add_bulk_args(p_week)
 
     p_risk = sub.add_parser("risk", help="Risk scores per learner")
-    p_risk.add_argument("--cohort", dest="cohort_id", required=True)
+    p_risk.add_argument("--cohort", dest="cohort_id", default=None, help="Omit to rank learners across all cohorts")
+    p_risk.add_argument("--company", dest="company_id", default=None, help="Without --cohort: rank only this company's cohorts")
     p_risk.add_argument("--top", dest="top", type=int, default=5)
+    p_risk.add_argument("--where", nargs="+", default=None, metavar="KEY=VALUE", help="Same filters as kpi --where, e.g. role=PM level=junior")
 
     p_rec = sub.add_parser("recommend", help="Recommend modules")
-    p_rec.add_argument("--role", required=True)
-    p_rec.add_argument("--level", required=True)
-    p_rec.add_argument("--weeks", type=int, required=True)
+    p_rec.add_argument("--role", default=None)
+    p_rec.add_argument("--level", default=None)
+    p_rec.add_argument("--weeks", type=int, default=None)
+    p_rec.add_argument("--batch", default=None, help="CSV with role,level,weeks,tags columns (tags separated by space/;/|)")
     p_rec.add_argument("--tags", nargs="*", default=[])
+    p_rec.add_argument("--hours-budget", dest="hours_budget", type=float, default=None, help="Solver mode: maximize relevance within this many total hours")
+    p_rec.add_argument("--week-hours", dest="week_hours", type=float, default=None, help="Solver mode: hours available per week")
+    p_rec.add_argument("--no-prereqs", dest="prereqs", action="store_false", help="Solver mode: ignore module prerequisites")
+
+    p_imp = sub.add_parser("import-sqlite", help="Convert the JSON dataset into an indexed SQLite database")
+    p_imp.add_argument("--out", required=True)
 
     p_aar = sub.add_parser("aar", help="Generate AAR for cohort")
-    p_aar.add_argument("--cohort", dest="cohort_id", required=True)
+    p_aar.add_argument("--cohort", dest="cohort_id", default=None)
+    p_aar.add_argument("--company", dest="company_id", default=None, help="With --all: only this company's cohorts")
+    _add_bulk_args(p_aar)
+
+    p_watch = sub.add_parser("watch", help="Early warning: stream per-learner EWMA risk alerts (JSON Lines) as events arrive")
+    p_watch.add_argument("--cohort", dest="cohort_id", default=None)
+    p_watch.add_argument("--threshold", type=float, default=0.5, help="Alert when risk crosses this value")
+    p_watch.add_argument("--slope", type=float, default=0.05, help="Alert when risk rises by this much per event (weighted)")
+    p_watch.add_argument("--halflife", type=float, default=3.0, help="Events after which an observation's weight halves")
+    p_watch.add_argument("--min-events", dest="min_events", type=int, default=3, help="Events per learner before alerts start")
+
+    p_serve = sub.add_parser("serve", help="Keep the dataset loaded and answer commands over a local socket")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--socket", default=None, help="Listen on this Unix socket path instead of a TCP port (created with mode 0600: only the owner can connect)")
+    p_serve.add_argument("--token", default=None, help="Require this token on every request (default: $CHATBOT_TOKEN); needed for a non-loopback --host")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = parser.parse_args(argv)
+    if args.connect:
+        from chatbot.client import run_client, strip_connect
+        sys.exit(run_client(args.connect, strip_connect(argv)))
+    if args.cmd == "serve":
+        from chatbot.server import serve
+        serve(parser, args)
+        return
+    tracer = trace.enable(memory=args.profile) if (args.timings or args.profile or args.trace) else None
+    try:
+        with trace.span(f"cli.{args.cmd or 'help'}"):
+            _run(parser, args)
+    finally:
+        if tracer is not None:
+            trace.disable()
+            tracer.report()
+            if args.trace:
+                tracer.write_chrome_trace(args.trace)
+
+
+def _run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    validate_args(parser, args)
+    if args.cmd == "watch":
+        _watch(parser, args)
+        return
+    data = load_dataset(args)
+    execute(parser, args, data, make_engine(parser, args, data))
+
+
+def _watch(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    # Events are consumed one by one; with --events nothing but the alert state is kept in memory.
+    from chatbot.early_warning import EarlyWarning, event_stream
+    if not args.events and args.data and is_sqlite_path(args.data):
+        parser.error("watch reads --events JSON Lines or a JSON dataset")
+    ew = EarlyWarning(threshold=args.threshold, slope=args.slope, halflife=args.halflife, min_events=args.min_events)
+    events = event_stream(args.events, None if args.events else load_data(args.data))
+    if args.cohort_id:
+        events = (e for e in events if str(e.get("cohort_id")) == str(args.cohort_id))
+    alerts = 0
+    for alert in ew.process(events):
+        alerts += 1
+        print(json.dumps(alert, ensure_ascii=False), flush=True)
+    print(f"이벤트 {ew.events}건, 알림 {alerts}건, 현재 위험 학습자 {len(ew.flagged())}명", file=sys.stderr)
+
+
+def validate_args(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    if args.cmd == "weekly" and not args.all and not (args.company_id and args.cohort_id):
+        parser.error("weekly requires --company and --cohort (or --all)")
+    if args.cmd == "kpi" and args.week is not None and not args.cohort_id:
+        parser.error("kpi --week requires --cohort (weeks count from the cohort's start_at)")
+    if args.cmd == "kpi" and (args.date_from or args.date_to) and not (args.date_from and args.date_to):
+        parser.error("kpi date ranges need both --from and --to")
+    if getattr(args, "week", None) is not None and args.week < 1:
+        parser.error("--week starts at 1")
+    if args.engine == "numpy" and args.cmd == "kpi" and (args.week is not None or args.date_from):
+        parser.error("--engine numpy has no date index; drop --engine for --week/--from/--to")
+    if getattr(args, "where", None):
+        if args.cmd == "kpi" and (args.group_by or args.week is not None or args.date_from):
+            parser.error("kpi --where cannot be combined with --group-by/--week/--from/--to")
+        if args.engine == "numpy":
+            parser.error("--engine numpy has no filter indexes; drop --engine for --where")
+    if args.cmd == "recommend" and not args.batch and (args.role is None or args.level is None or args.weeks is None):
+        parser.error("recommend requires --role, --level and --weeks (or --batch)")
+    if args.cmd == "aar" and not args.all and not args.cohort_id:
+        parser.error("aar requires --cohort (or --all)")
+    if args.events and args.engine == "numpy":
+        parser.error("--engine numpy needs raw event tables; it cannot be combined with --events")
+
+
+def load_dataset(args: argparse.Namespace) -> Any:
+    with trace.span("load"):
+        if args.events:
+            from chatbot.stream import load_streaming
+            data = load_streaming(args.events, args.data)
+        elif args.no_cache or (args.data and is_sqlite_path(args.data)):
+            data = load_store(args.data)
+        else:
+            from chatbot.snapshot import load_cached_store
+            data = load_cached_store(args.data)
+    return data
+
+
+def make_engine(parser: argparse.ArgumentParser, args: argparse.Namespace, data: Any) -> Any:
+    if args.engine != "numpy" or args.cmd not in ("kpi", "risk"):
+        return None
+    if isinstance(data, SqliteStore):
+        parser.error("--engine numpy reads in-memory tables; use the default engine with a SQLite --data")
+    from chatbot.vectorized import ArrayEngine
+    with trace.span("load.arrays"):
+        return ArrayEngine(data)
 
-    args = parser.parse_args()
-    data = load_data()
 
-    if args.cmd == "kpi":
-        kpis = compute_kpis(data, company_id=args.company_id, cohort_id=args.cohort_id)
+def execute(parser: argparse.ArgumentParser, args: argparse.Namespace, data: Any, engine: Any = None) -> None:
+    if args.cmd == "import-sqlite":
+        import_json(load_data(args.data), args.out)
+        print(f"SQLite 생성 완료: {args.out}")
+    elif args.cmd == "kpi" and args.group_by:
+        for gid, kpis in compute_kpis_grouped(data, args.group_by, company_id=args.company_id).items():
+            print(gid, kpis)
+    elif args.cmd == "kpi" and args.week is not None:
+        try:
+            res = compute_kpis_week(data, args.cohort_id, args.week, company_id=args.company_id)
+        except ValueError as e:
+            parser.error(str(e))
+        print(f"Week {res['week']} ({res['from']} ~ {res['to']})", res["kpis"])
+        if res["delta"] is not None:
+            print("전주 대비", res["delta"])
+    elif args.cmd == "kpi" and args.date_from:
+        try:
+            start, end = parse_date(args.date_from), parse_date(args.date_to) + timedelta(days=1)
+        except ValueError as e:
+            parser.error(f"bad --from/--to date: {e}")
+        print(compute_kpis_range(data, start, end, company_id=args.company_id, cohort_id=args.cohort_id))
+    elif args.cmd == "kpi":
+        if engine is not None:
+            kpis = engine.compute_kpis(company_id=args.company_id, cohort_id=args.cohort_id)
+        else:
+            try:
+                kpis = compute_kpis(data, company_id=args.company_id, cohort_id=args.cohort_id, where=parse_kv_args(args.where or []))
+            except ValueError as e:
+                parser.error(str(e))
         print(kpis)
+    elif args.cmd in ("weekly", "aar") and args.all:
+        from chatbot.bulk import generate_all
+        paths = generate_all(data, args.cmd, args.out_dir, company_id=args.company_id, workers=args.workers, week=getattr(args, "week", None))
+        print(f"{len(paths)}개 리포트 생성: {args.out_dir}")
     elif args.cmd == "weekly":
-        print(weekly_report(data, args.company_id, args.cohort_id))
+        try:
+            print(weekly_report(data, args.company_id, args.cohort_id, week=args.week))
+        except ValueError as e:
+            parser.error(str(e))
     elif args.cmd == "risk":
-        rows = risk_scores(data, args.cohort_id)[: args.top]
+        if engine is not None:
+            if not args.cohort_id:
+                parser.error("--engine numpy ranks one cohort at a time; pass --cohort")
+            rows = engine.risk_scores(args.cohort_id)[: args.top]
+        else:
+            try:
+                rows = top_risks(data, args.top, cohort_id=args.cohort_id, company_id=args.company_id, where=parse_kv_args(args.where or []))
+            except ValueError as e:
+                parser.error(str(e))
         for lid, r, detail in rows:
             print(lid, r, detail)
+    elif args.cmd == "recommend" and args.batch:
+        for i, rec in enumerate(recommend_batch(data, _read_batch(args.batch)), 1):
+            _print_recommendation(rec, prefix=f"[{i}] ")
+    elif args.cmd == "recommend" and (args.hours_budget is not None or args.week_hours is not None):
+        plan = plan_curriculum(data, args.role, args.level, args.weeks, args.tags, hours_budget=args.hours_budget, week_hours=args.week_hours, respect_prereqs=args.prereqs)
+        label = "최적 커리큘럼" if plan["optimal"] else "커리큘럼(휴리스틱, 최적 미보장)"
+        print(f"{label}: role={plan['role']} level={plan['level']} weeks={plan['weeks']} total_hours={plan['total_hours']} score={plan['score']}")
+        by_id = {m["id"]: m for m in plan["modules"]}
+        for week in plan["schedule"]:
+            items = ", ".join(f"{mid}({by_id[mid].get('duration_hours', 2)}h)" for mid in week["modules"]) or "-"
+            print(f"- Week{week['week']} [{week['hours']}h] {items}")
     elif args.cmd == "recommend":
-        rec = recommend_modules(data, args.role, args.level, args.weeks, args.tags)
-        print(f"추천 요약: role={rec['role']} level={rec['level']} weeks={rec['weeks']} total_hours={rec['total_hours']}")
-        for m in rec["modules"]:
-            print(f"- {m['id']} | {m['topic']} ({m.get('duration_hours', 2)}h) | tags={','.join(m.get('tags', []))}")
+        _print_recommendation(recommend_modules(data, args.role, args.level, args.weeks, args.tags))
     elif args.cmd == "aar":
         print(generate_aar(data, args.cohort_id))
     else:
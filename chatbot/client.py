@@ -0,0 +1,90 @@
+import json
+import os
+import socket
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# Deliberately stdlib-only: `python -m chatbot.client` must start without importing the chatbot core.
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+
+
+def parse_address(address: str) -> Tuple[int, Union[str, Tuple[str, int]]]:
+    """``host:port``/``port`` -> TCP; anything path-like (or ``unix:PATH``) -> Unix socket."""
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[5:]
+    if os.sep in address or "/" in address or address.endswith(".sock"):
+        return socket.AF_UNIX, address
+    host, _, port = address.rpartition(":")
+    return socket.AF_INET, (host or "127.0.0.1", int(port))
+
+
+def strip_connect(argv: List[str]) -> List[str]:
+    out = []
+    skip = False
+    for a in argv:
+        if skip:
+            skip = False
+        elif a == "--connect":
+            skip = True
+        elif not a.startswith("--connect="):
+            out.append(a)
+    return out
+
+
+class Client:
+    """One persistent connection to a ``serve`` daemon; send any number of commands over it."""
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, timeout: Optional[float] = None, token: Optional[str] = None):
+        # The daemon's shared token, if it was started with one.
+        self.token = token or os.environ.get("CHATBOT_TOKEN")
+        family, addr = parse_address(address)
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        self.sock.connect(addr)
+        self._file = self.sock.makefile("rwb")
+
+    def query(self, argv: List[str]) -> Dict[str, Any]:
+        """Run one CLI command line (e.g. ``["kpi", "--cohort", "A-1"]``); returns stdout/stderr/code."""
+        req: Dict[str, Any] = {"argv": list(argv)}
+        if self.token:
+            req["token"] = self.token
+        self._file.write(json.dumps(req, ensure_ascii=False).encode("utf-8") + b"\n")
+        self._file.flush()
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self._file.close()
+        self.sock.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def run_client(address: str, argv: List[str]) -> int:
+    with Client(address) as client:
+        resp = client.query(argv)
+    sys.stdout.write(resp.get("stdout", ""))
+    sys.stderr.write(resp.get("stderr", ""))
+    return int(resp.get("code", 0))
+
+
+def main() -> None:
+    # Usage: python -m chatbot.client [--connect ADDR] <cli command...>; ADDR defaults to $CHATBOT_SERVER.
+    argv = sys.argv[1:]
+    address = os.environ.get("CHATBOT_SERVER") or DEFAULT_ADDRESS
+    if argv[:1] == ["--connect"] and len(argv) > 1:
+        address, argv = argv[1], argv[2:]
+    elif argv and argv[0].startswith("--connect="):
+        address, argv = argv[0].split("=", 1)[1], argv[1:]
+    sys.exit(run_client(address, argv))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from chatbot.store import EVENT_TABLES
+from chatbot.stream import event_kind, iter_jsonl
+
+
+def _alpha(halflife: float) -> float:
+    # Weight of the newest observation such that an old one halves every `halflife` events.
+    return 1 - 0.5 ** (1 / halflife)
+
+
+class LearnerTrend:
+    """Exponentially weighted attendance/score/satisfaction of one learner.
+
+    A metric contributes no risk until its first event, which seeds the
+    average; later events move it by ``alpha``. ``slope`` is the
+    exponentially weighted per-event change in risk.
+    """
+
+    __slots__ = ("cohort_id", "attendance", "score", "satisfaction", "risk", "slope", "events", "flagged", "rising")
+
+    def __init__(self, cohort_id: str):
+        self.cohort_id = cohort_id
+        self.attendance: Optional[float] = None
+        self.score: Optional[float] = None
+        self.satisfaction: Optional[float] = None
+        self.risk = 0.0
+        self.slope = 0.0
+        self.events = 0
+        self.flagged = False
+        self.rising = False
+
+    def compute_risk(self) -> float:
+        # Same weights as LearnerStats.risk, on the weighted averages.
+        risk = 0.0
+        if self.attendance is not None:
+            risk += (1 - self.attendance) * 0.5
+        if self.score is not None:
+            risk += (max(0, (60 - self.score)) / 60) * 0.3
+        if self.satisfaction is not None:
+            risk += (max(0, (3.5 - self.satisfaction)) / 3.5) * 0.2
+        return risk
+
+    def detail(self) -> Dict[str, Any]:
+        return {
+            "attendance": None if self.attendance is None else round(self.attendance, 2),
+            "score": None if self.score is None else round(self.score, 1),
+            "satisfaction": None if self.satisfaction is None else round(self.satisfaction, 2),
+        }
+
+
+class EarlyWarning:
+    """Per-learner EWMA risk state updated in O(1) per event, emitting alerts as it changes.
+
+    Alerts (dicts) are emitted when a learner's risk crosses ``threshold``
+    upward (``"threshold"``), when the weighted per-event risk increase
+    reaches ``slope`` (``"rising"``), and when a flagged learner falls back
+    below ``threshold - hysteresis`` (``"recovered"``). Each condition fires
+    once until it clears, so a learner hovering at the line is not re-alerted
+    on every event. No alerts are raised before a learner's ``min_events``-th
+    event, when a single absence would otherwise dominate the average.
+    """
+
+    def __init__(self, threshold: float = 0.5, slope: float = 0.05, halflife: float = 3.0, hysteresis: float = 0.05, min_events: int = 3):
+        if halflife <= 0:
+            raise ValueError("halflife must be > 0")
+        self.threshold = threshold
+        self.slope = slope
+        self.hysteresis = hysteresis
+        self.min_events = min_events
+        self.alpha = _alpha(halflife)
+        self.learners: Dict[str, LearnerTrend] = {}
+        self.events = 0
+
+    def _blend(self, current: Optional[float], value: float) -> float:
+        return value if current is None else current + self.alpha * (value - current)
+
+    def update(self, event: dict, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        kind = kind or event_kind(event)
+        if kind not in EVENT_TABLES:
+            return []
+        lid = str(event["learner_id"])
+        t = self.learners.get(lid)
+        if t is None:
+            t = self.learners[lid] = LearnerTrend(str(event["cohort_id"]))
+        if kind == "attendance":
+            t.attendance = self._blend(t.attendance, 1.0 if event.get("status") == "present" else 0.0)
+        elif kind == "assessments":
+            t.score = self._blend(t.score, event["score"])
+        else:
+            t.satisfaction = self._blend(t.satisfaction, event["rating"])
+        self.events += 1
+        t.events += 1
+        prev = t.risk
+        t.risk = t.compute_risk()
+        if t.events > 1:
+            t.slope += self.alpha * ((t.risk - prev) - t.slope)
+
+        alerts: List[Dict[str, Any]] = []
+        if t.events < self.min_events:
+            return alerts
+        if not t.flagged and t.risk >= self.threshold:
+            t.flagged = True
+            alerts.append(self._alert("threshold", lid, t, event))
+        elif t.flagged and t.risk < self.threshold - self.hysteresis:
+            t.flagged = False
+            alerts.append(self._alert("recovered", lid, t, event))
+        if not t.rising and t.slope >= self.slope:
+            t.rising = True
+            alerts.append(self._alert("rising", lid, t, event))
+        elif t.rising and t.slope < self.slope / 2:
+            t.rising = False
+        return alerts
+
+    def _alert(self, kind: str, lid: str, t: LearnerTrend, event: dict) -> Dict[str, Any]:
+        alert = {"alert": kind, "learner_id": lid, "cohort_id": t.cohort_id, "risk": round(t.risk, 3), "slope": round(t.slope, 4)}
+        day = event.get("date") or event.get("timestamp")
+        if day:
+            alert["date"] = day
+        alert.update(t.detail())
+        return alert
+
+    def process(self, events: Iterable[dict], kind: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        for event in events:
+            yield from self.update(event, kind)
+
+    def flagged(self, cohort_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Learners currently over the threshold, highest risk first."""
+        rows = [
+            dict({"learner_id": lid, "cohort_id": t.cohort_id, "risk": round(t.risk, 3), "slope": round(t.slope, 4)}, **t.detail())
+            for lid, t in self.learners.items()
+            if t.flagged and (cohort_id is None or t.cohort_id == str(cohort_id))
+        ]
+        rows.sort(key=lambda r: r["risk"], reverse=True)
+        return rows
+
+
+def dataset_events(data: Any) -> List[dict]:
+    """Event rows of a seed-format dataset in date order (undated rows first, in table order)."""
+    rows = [dict(r, kind=table) for table in EVENT_TABLES for r in data.get(table, [])]
+    rows.sort(key=lambda r: str(r.get("date") or r.get("timestamp") or ""))
+    return rows
+
+
+def event_stream(events: Optional[List[str]], data: Any = None) -> Iterator[dict]:
+    """Events from JSON Lines paths (``-`` for stdin, in arrival order), or else from a loaded dataset."""
+    if events:
+        return iter_jsonl(events)
+    return iter(dataset_events(data))
@@ -0,0 +1,152 @@
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from chatbot.aggregate import Aggregate
+from chatbot.timeline import parse_date
+
+# Filter key (as typed in `key=value` args) -> canonical field.
+FILTER_KEYS = {
+    "company": "company_id",
+    "company_id": "company_id",
+    "cohort": "cohort_id",
+    "cohort_id": "cohort_id",
+    "learner": "learner_id",
+    "learner_id": "learner_id",
+    "role": "role",
+    "level": "level",
+    "active_from": "active_from",
+    "active_to": "active_to",
+}
+LEARNER_FIELDS = ("learner_id", "role", "level")
+# Role/level match case-insensitively ("PM" == "pm"); ids match exactly.
+_FOLDED = ("role", "level")
+
+
+def normalize(field: str, value: Any) -> str:
+    text = str(value).strip()
+    return text.lower() if field in _FOLDED else text
+
+
+class QueryIndex:
+    """Filter indexes of one store, with values normalized once when built.
+
+    Learners are bucketed by id/role/level and cohort periods parsed to day
+    ordinals, so a compiled query resolves by dict lookups and set
+    intersection instead of comparing every record.
+    """
+
+    def __init__(self, store: Any):
+        self.learner_cohort: Dict[str, str] = {}
+        self.learners: Dict[str, Dict[str, Set[str]]] = {f: defaultdict(set) for f in LEARNER_FIELDS}
+        for l in store["learners"]:
+            lid = str(l["id"])
+            self.learner_cohort[lid] = str(l["cohort_id"])
+            self.learners["learner_id"][lid].add(lid)
+            for field in _FOLDED:
+                if l.get(field) is not None:
+                    self.learners[field][normalize(field, l[field])].add(lid)
+        # cohort -> (first day, last day) ordinals; None where start_at/end_at is missing.
+        self.periods: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+        for cid, c in store.cohorts_by_id.items():
+            start, end = c.get("start_at"), c.get("end_at")
+            self.periods[cid] = (parse_date(start).toordinal() if start else None, parse_date(end).toordinal() if end else None)
+
+    def lookup(self, field: str, values: Iterable[str]) -> Set[str]:
+        index = self.learners[field]
+        out: Set[str] = set()
+        for v in values:
+            out |= index.get(v, set())
+        return out
+
+
+class Query:
+    """A filter dict compiled once into index lookups.
+
+    Each key takes one value or a comma-separated list (``role=PM,Designer``);
+    keys combine with AND, values within a key with OR. Cohort keys
+    (company/cohort, and ``active_from``/``active_to`` for cohorts running at
+    any point in that inclusive range) narrow the cohorts; learner keys
+    (learner/role/level) narrow the roster and the events counted.
+    """
+
+    def __init__(self, filters: Dict[str, Any]):
+        self.terms: Dict[str, FrozenSet[str]] = {}
+        self.active_from: Optional[int] = None
+        self.active_to: Optional[int] = None
+        for key, value in filters.items():
+            self.add(key, value)
+
+    def add(self, key: str, value: Any) -> "Query":
+        field = FILTER_KEYS.get(str(key).strip().lower())
+        if field is None:
+            raise ValueError(f"unknown filter {key!r}; expected one of {', '.join(sorted(FILTER_KEYS))}")
+        if value is None or value == "":
+            return self
+        if field == "active_from":
+            self.active_from = parse_date(value).toordinal()
+        elif field == "active_to":
+            self.active_to = parse_date(value).toordinal()
+        else:
+            parts = value if isinstance(value, (list, tuple, set, frozenset)) else str(value).split(",")
+            values = frozenset(normalize(field, v) for v in parts if str(v).strip())
+            # The same field given twice (e.g. --company plus company=) must satisfy both.
+            self.terms[field] = self.terms[field] & values if field in self.terms else values
+        return self
+
+    @property
+    def learner_filtered(self) -> bool:
+        return any(f in self.terms for f in LEARNER_FIELDS)
+
+    def cohorts(self, store: Any) -> List[str]:
+        cohort_ids = self.terms.get("cohort_id")
+        companies = self.terms.get("company_id")
+        if cohort_ids is not None:
+            # Several ids come back in store order, as select_cohorts would list them.
+            if len(cohort_ids) == 1:
+                candidates = [cid for cid in cohort_ids if cid in store.cohorts_by_id]
+            else:
+                candidates = [cid for cid in store.cohorts_by_id if cid in cohort_ids]
+            if companies is not None:
+                candidates = [cid for cid in candidates if str(store.cohorts_by_id[cid].get("company_id")) in companies]
+        elif companies is not None:
+            candidates = [cid for comp in sorted(companies) for cid in store.cohorts_by_company.get(comp, [])]
+        else:
+            candidates = list(store.cohorts_by_id)
+        if self.active_from is None and self.active_to is None:
+            return candidates
+        periods = store.query_index.periods
+        out = []
+        for cid in candidates:
+            start, end = periods.get(cid, (None, None))
+            if self.active_to is not None and start is not None and start > self.active_to:
+                continue
+            if self.active_from is not None and end is not None and end < self.active_from:
+                continue
+            out.append(cid)
+        return out
+
+    def learners(self, store: Any, cohort_ids: Iterable[str]) -> Optional[Set[str]]:
+        """Ids of matching learners within ``cohort_ids``; None when no learner key was given."""
+        if not self.learner_filtered:
+            return None
+        index = store.query_index
+        # Smallest bucket first keeps the intersections cheap.
+        sets = sorted((index.lookup(f, self.terms[f]) for f in LEARNER_FIELDS if f in self.terms), key=len)
+        matched = set(sets[0]).intersection(*sets[1:])
+        cohorts = set(cohort_ids)
+        return {lid for lid in matched if index.learner_cohort.get(lid) in cohorts}
+
+    def aggregate(self, store: Any) -> Aggregate:
+        cohort_ids = self.cohorts(store)
+        learner_ids = self.learners(store, cohort_ids)
+        if learner_ids is None:
+            return store.aggregate(cohort_ids)
+        return store.aggregate_learners(cohort_ids, learner_ids)
+
+
+def compile_query(filters: Optional[Dict[str, Any]] = None, **fields: Any) -> Query:
+    """Compile ``filters`` (e.g. ``parse_kv_args`` output) plus keyword filters into a ``Query``."""
+    query = Query(filters or {})
+    for key, value in fields.items():
+        query.add(key, value)
+    return query
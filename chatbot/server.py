@@ -0,0 +1,207 @@
+import argparse
+import hmac
+import io
+import ipaddress
+import json
+import os
+import shlex
+import signal
+import socketserver
+import stat
+import sys
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional, Tuple
+
+from chatbot import trace
+from chatbot.cli import execute, load_dataset, make_engine, validate_args
+from chatbot.core import DATA_PATH
+from chatbot.stream import expand_paths
+
+# Commands a client may not run: they would change what the daemon serves, start another one, or stream without end.
+BLOCKED_COMMANDS = ("serve", "import-sqlite", "watch")
+# Options a client may not set: they make the server process read or write files at client-chosen
+# paths (--all also forks a process pool from inside the threaded server). Checked on parsed values,
+# so abbreviations like --out are caught too.
+BLOCKED_OPTIONS = {"all": ("--all", False), "out_dir": ("--out-dir", "reports"), "trace": ("--trace", None), "batch": ("--batch", None)}
+TOKEN_ENV = "CHATBOT_TOKEN"
+
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class Daemon:
+    """Holds one loaded dataset and runs CLI commands against it.
+
+    Before each command the source files are stat()ed; when any mtime/size
+    changed, the dataset is reloaded (through the snapshot cache, as the CLI
+    does). Commands run one at a time: they share the store, and their
+    stdout/stderr are captured by redirecting the process-wide streams.
+    With a token set, requests without the same ``token`` are refused.
+    """
+
+    def __init__(self, parser: argparse.ArgumentParser, args: argparse.Namespace):
+        self.parser = parser
+        self.args = args
+        self.lock = threading.Lock()
+        self.data: Any = None
+        self.engine: Any = None
+        self.signature: Optional[Tuple[Any, ...]] = None
+        self.reloads = 0
+        self.token: Optional[str] = getattr(args, "token", None) or os.environ.get(TOKEN_ENV) or None
+        self.ensure_fresh()
+
+    def sources(self) -> List[str]:
+        paths = [self.args.data or DATA_PATH]
+        if self.args.events:
+            paths.extend(expand_paths(self.args.events))
+        return paths
+
+    def _signature(self) -> Tuple[Any, ...]:
+        sig = []
+        for p in self.sources():
+            try:
+                st = os.stat(p)
+                sig.append((p, st.st_mtime_ns, st.st_size))
+            except OSError:
+                sig.append((p, None, None))
+        return tuple(sig)
+
+    def ensure_fresh(self) -> Any:
+        sig = self._signature()
+        if sig != self.signature:
+            self.data = load_dataset(self.args)
+            self.engine = None
+            self.signature = sig
+            self.reloads += 1
+        return self.data
+
+    def _parse(self, argv: List[str]) -> argparse.Namespace:
+        args = self.parser.parse_args(argv)
+        if args.cmd in BLOCKED_COMMANDS or args.connect:
+            self.parser.error(f"{args.cmd or '--connect'} is not available through the daemon")
+        if args.data or args.events or args.no_cache:
+            self.parser.error("--data/--events/--no-cache are fixed when the daemon starts")
+        blocked = [flag for name, (flag, default) in BLOCKED_OPTIONS.items() if getattr(args, name, default) != default]
+        if blocked:
+            self.parser.error(f"{'/'.join(blocked)} is not available through the daemon (it reads or writes files on the server)")
+        args.data, args.events, args.no_cache = self.args.data, self.args.events, self.args.no_cache
+        return args
+
+    def authorized(self, request: Dict[str, Any]) -> bool:
+        if not self.token:
+            return True
+        return hmac.compare_digest(str(request.get("token") or "").encode("utf-8"), self.token.encode("utf-8"))
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.authorized(request):
+            return {"ok": False, "code": 2, "stdout": "", "stderr": "unauthorized: missing or wrong token\n"}
+        argv = request.get("argv")
+        if isinstance(argv, str):
+            argv = shlex.split(argv)
+        out, err = io.StringIO(), io.StringIO()
+        code = 0
+        with self.lock, redirect_stdout(out), redirect_stderr(err):
+            tracer = None
+            try:
+                args = self._parse(list(argv or []))
+                validate_args(self.parser, args)
+                if args.timings or args.profile:
+                    tracer = trace.enable(memory=args.profile)
+                with trace.span(f"serve.{args.cmd or 'help'}"):
+                    data = self.ensure_fresh()
+                    if args.engine == "numpy" and self.engine is None:
+                        self.engine = make_engine(self.parser, args, data)
+                    engine = self.engine if args.engine == "numpy" else None
+                    execute(self.parser, args, data, engine)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:  # keep serving; report like an uncaught CLI error would
+                print(f"{type(e).__name__}: {e}", file=sys.stderr)
+                code = 1
+            finally:
+                if tracer is not None:
+                    trace.disable()
+                    tracer.report()
+        return {"ok": code == 0, "code": code, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    # Newline-delimited JSON: one request object per line, one response per line; connections stay open.
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"ok": False, "code": 2, "stdout": "", "stderr": f"bad request: {e}\n"}
+            else:
+                response = self.server.chatbot.handle(request)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:  # Windows
+    _UnixServer = None
+
+
+def remove_stale_socket(path: str) -> None:
+    """Unlink a socket left behind at ``path``; anything else there is an error, never deleted."""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise SystemExit(f"refusing to replace {path}: it exists and is not a socket")
+    os.unlink(path)
+
+
+def make_server(parser: argparse.ArgumentParser, args: argparse.Namespace) -> socketserver.BaseServer:
+    if not args.socket and not is_loopback(args.host) and not (getattr(args, "token", None) or os.environ.get(TOKEN_ENV)):
+        raise SystemExit(f"refusing to listen on {args.host} without a token: pass --token or set {TOKEN_ENV}")
+    daemon = Daemon(parser, args)
+    if args.socket:
+        if _UnixServer is None:
+            raise SystemExit("Unix sockets are not available on this platform; use --port")
+        remove_stale_socket(args.socket)
+        # A token is optional on the Unix socket, so mode 0600 is what keeps other local users out.
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(args.socket, _Handler)
+        finally:
+            os.umask(old_umask)
+    else:
+        server = _TCPServer((args.host, args.port), _Handler)
+    server.chatbot = daemon
+    return server
+
+
+def serve(parser: argparse.ArgumentParser, args: argparse.Namespace) -> None:
+    server = make_server(parser, args)
+    where = args.socket or f"{args.host}:{server.server_address[1]}"
+    print(f"chatbot 서버 대기 중: {where} (Ctrl+C로 종료)", file=sys.stderr)
+    # Service managers stop with SIGTERM; unwind through finally so the socket file is removed.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket:
+            remove_stale_socket(args.socket)
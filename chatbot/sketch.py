@@ -0,0 +1,136 @@
+import math
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Reported percentiles: key -> quantile.
+PERCENTILES = (("p10", 0.1), ("p50", 0.5), ("p90", 0.9))
+
+
+class QuantileSketch:
+    """Mergeable quantile summary of a stream of numbers.
+
+    While the stream has at most ``k`` distinct values (quiz scores, 0.5-step
+    ratings) it keeps exact value counts, so quantiles are exact and do not
+    depend on insertion or merge order. Past that it switches to KLL
+    compactors: level ``h`` holds items of weight ``2**h`` and, when full, is
+    sorted and every other item promoted, so memory stays O(k) and rank error
+    O(n/k). Sketches of separate cohorts or shards merge level by level
+    without touching the raw values.
+    """
+
+    __slots__ = ("k", "n", "counts", "levels", "_flip")
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.n = 0
+        self.counts: Optional[Dict[float, int]] = {}
+        self.levels: List[List[float]] = []
+        self._flip = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def add(self, value: float, weight: int = 1) -> None:
+        if weight <= 0:
+            return
+        self.n += weight
+        if self.counts is not None:
+            self.counts[value] = self.counts.get(value, 0) + weight
+            if len(self.counts) > self.k:
+                self._to_levels()
+            return
+        self._insert(value, weight)
+        self._compress()
+
+    def update(self, values: Iterable[float]) -> "QuantileSketch":
+        for v in values:
+            self.add(v)
+        return self
+
+    def _insert(self, value: float, weight: int) -> None:
+        # A weight-w item is its binary expansion: one copy at level h per set bit.
+        h = 0
+        while weight:
+            if weight & 1:
+                while len(self.levels) <= h:
+                    self.levels.append([])
+                self.levels[h].append(value)
+            weight >>= 1
+            h += 1
+
+    def _to_levels(self) -> None:
+        counts, self.counts = self.counts, None
+        for value, weight in counts.items():
+            self._insert(value, weight)
+        self._compress()
+
+    def _capacity(self, h: int) -> int:
+        return max(2, math.ceil(self.k * (2 / 3) ** (len(self.levels) - h - 1)))
+
+    def _compress(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self._capacity(h):
+                level.sort()
+                keep = [level.pop()] if len(level) % 2 else []
+                # Alternate which half survives so the rank error does not drift one way.
+                self._flip ^= 1
+                if h + 1 == len(self.levels):
+                    self.levels.append([])
+                self.levels[h + 1].extend(level[self._flip::2])
+                self.levels[h] = keep
+            h += 1
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if not other.n:
+            return self
+        self.n += other.n
+        if self.counts is not None and other.counts is not None:
+            for value, weight in other.counts.items():
+                self.counts[value] = self.counts.get(value, 0) + weight
+            if len(self.counts) > self.k:
+                self._to_levels()
+            return self
+        if self.counts is not None:
+            self._to_levels()
+        if other.counts is not None:
+            for value, weight in other.counts.items():
+                self._insert(value, weight)
+        else:
+            for h, level in enumerate(other.levels):
+                while len(self.levels) <= h:
+                    self.levels.append([])
+                self.levels[h].extend(level)
+        self._compress()
+        return self
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        if self.counts is not None:
+            return sorted(self.counts.items())
+        return sorted((v, 1 << h) for h, level in enumerate(self.levels) for v in level)
+
+    def quantiles(self, qs: Iterable[float]) -> List[Optional[float]]:
+        """Nearest-rank quantiles: the smallest value with at least ``ceil(q * n)`` values at or below it."""
+        qs = list(qs)
+        if not self.n:
+            return [None] * len(qs)
+        items = self._weighted()
+        out = []
+        for q in qs:
+            # Rounded first so float noise (0.1 * 30 = 3.0000000000000004) cannot bump the rank.
+            rank = max(1, math.ceil(round(q * self.n, 9)))
+            cum = 0
+            value = items[-1][0]
+            for v, w in items:
+                cum += w
+                if cum >= rank:
+                    value = v
+                    break
+            out.append(value)
+        return out
+
+    def quantile(self, q: float) -> Optional[float]:
+        return self.quantiles([q])[0]
+
+    def percentiles(self) -> Dict[str, Optional[float]]:
+        return dict(zip((name for name, _ in PERCENTILES), self.quantiles(q for _, q in PERCENTILES)))
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Optional
+
+from chatbot.core import DATA_PATH, load_store
+from chatbot.store import OpsStore
+from chatbot.trace import span
+
+
+# Bump when OpsStore's layout changes so old snapshots are rebuilt.
+SNAPSHOT_VERSION = 5
+
+
+def _file_hash(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def snapshot_path(source: str, cache_dir: Optional[str] = None) -> str:
+    source = os.path.abspath(source)
+    cache_dir = cache_dir or os.environ.get("CHATBOT_CACHE_DIR") or os.path.join(os.path.dirname(source), ".cache")
+    key = hashlib.sha1(source.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"{os.path.basename(source)}.{key}.snapshot")
+
+
+def _read_header(f) -> Optional[Dict[str, Any]]:
+    try:
+        header = pickle.load(f)
+    except Exception:
+        return None
+    return header if isinstance(header, dict) and header.get("version") == SNAPSHOT_VERSION else None
+
+
+def _write(snap: str, header: Dict[str, Any], store: OpsStore) -> None:
+    os.makedirs(os.path.dirname(snap), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(snap), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            # Header first so freshness can be checked without unpickling the store.
+            pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snap)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def load_cached_store(path: Optional[str] = None, cache_dir: Optional[str] = None) -> OpsStore:
+    """Load an indexed OpsStore from a pickle snapshot, rebuilding it when the source changed.
+
+    Freshness is checked on mtime/size first; on mismatch the content hash
+    decides, so a touched-but-identical file does not force a rebuild.
+    """
+    source = path or DATA_PATH
+    st = os.stat(source)
+    snap = snapshot_path(source, cache_dir)
+    digest = None
+    if os.path.exists(snap):
+        with open(snap, "rb") as f:
+            header = _read_header(f)
+            if header is not None:
+                fresh = header.get("mtime_ns") == st.st_mtime_ns and header.get("size") == st.st_size
+                if not fresh and header.get("size") == st.st_size:
+                    digest = _file_hash(source)
+                    fresh = header.get("sha256") == digest
+                if fresh:
+                    try:
+                        with span("load.snapshot", path=snap):
+                            store = pickle.load(f)
+                    except Exception:
+                        store = None
+                    if isinstance(store, OpsStore):
+                        if header.get("mtime_ns") != st.st_mtime_ns:
+                            _try_write(snap, dict(header, mtime_ns=st.st_mtime_ns), store)
+                        return store
+
+    store = load_store(source)
+    header = {"version": SNAPSHOT_VERSION, "mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest or _file_hash(source)}
+    with span("load.snapshot_write", path=snap):
+        _try_write(snap, header, store)
+    return store
+
+
+def _try_write(snap: str, header: Dict[str, Any], store: OpsStore) -> None:
+    # A read-only deploy directory only costs the speed-up, never the query.
+    try:
+        _write(snap, header, store)
+    except OSError:
+        pass
@@ -0,0 +1,238 @@
+import json
+import os
+import sqlite3
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from chatbot.aggregate import Aggregate
+from chatbot.store import OpsStore
+from chatbot.timeline import event_date
+
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+SCHEMA = """
+-- score/rating are declared without a type so ints stay ints and floats stay floats,
+-- matching the JSON path's averages exactly.
+CREATE TABLE IF NOT EXISTS companies (id TEXT PRIMARY KEY, name TEXT);
+CREATE TABLE IF NOT EXISTS cohorts (id TEXT PRIMARY KEY, company_id TEXT, name TEXT, start_at TEXT, end_at TEXT);
+CREATE TABLE IF NOT EXISTS learners (id TEXT PRIMARY KEY, name TEXT, company_id TEXT, cohort_id TEXT, role TEXT, level TEXT);
+-- Event dates are ISO 'YYYY-MM-DD' text (NULL when the source row has none), so ranges compare as strings.
+CREATE TABLE IF NOT EXISTS attendance (learner_id TEXT, cohort_id TEXT, status TEXT, date TEXT);
+CREATE TABLE IF NOT EXISTS assessments (learner_id TEXT, cohort_id TEXT, type TEXT, score, submitted INTEGER, date TEXT);
+CREATE TABLE IF NOT EXISTS satisfaction (learner_id TEXT, cohort_id TEXT, rating, text TEXT, date TEXT);
+CREATE TABLE IF NOT EXISTS modules (position INTEGER PRIMARY KEY, id TEXT, level TEXT, duration_hours REAL, doc TEXT);
+CREATE TABLE IF NOT EXISTS module_tags (position INTEGER, tag TEXT);
+CREATE INDEX IF NOT EXISTS idx_cohorts_company ON cohorts(company_id);
+CREATE INDEX IF NOT EXISTS idx_learners_cohort ON learners(cohort_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_cohort ON attendance(cohort_id, learner_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_learner ON attendance(learner_id);
+CREATE INDEX IF NOT EXISTS idx_assessments_cohort ON assessments(cohort_id, learner_id);
+CREATE INDEX IF NOT EXISTS idx_assessments_learner ON assessments(learner_id);
+CREATE INDEX IF NOT EXISTS idx_satisfaction_cohort ON satisfaction(cohort_id, learner_id);
+CREATE INDEX IF NOT EXISTS idx_satisfaction_learner ON satisfaction(learner_id);
+CREATE INDEX IF NOT EXISTS idx_attendance_date ON attendance(cohort_id, date);
+CREATE INDEX IF NOT EXISTS idx_assessments_date ON assessments(cohort_id, date);
+CREATE INDEX IF NOT EXISTS idx_satisfaction_date ON satisfaction(cohort_id, date);
+CREATE INDEX IF NOT EXISTS idx_modules_level ON modules(level);
+CREATE INDEX IF NOT EXISTS idx_module_tags_tag ON module_tags(tag, position);
+"""
+
+# NPS buckets in SQL. Python's round() is half-to-even, so round(2r) >= 9
+# exactly when 2r > 8.5 and round(2r) <= 6 exactly when 2r <= 6.5.
+_PROMOTER = "SUM(rating * 2 > 8.5)"
+_DETRACTOR = "SUM(rating * 2 <= 6.5)"
+
+
+def is_sqlite_path(path: str) -> bool:
+    return str(path).lower().endswith(SQLITE_SUFFIXES)
+
+
+def import_json(data: Dict[str, Any], db_path: str) -> None:
+    """Create (or replace) a SQLite database from a seed-format dataset."""
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(SCHEMA)
+        conn.executemany("INSERT OR IGNORE INTO companies VALUES (?, ?)", [(c["id"], c.get("name")) for c in data.get("companies", [])])
+        conn.executemany("INSERT OR IGNORE INTO cohorts VALUES (?, ?, ?, ?, ?)", [(str(c["id"]), str(c.get("company_id")), c.get("name"), c.get("start_at"), c.get("end_at")) for c in data.get("cohorts", [])])
+        conn.executemany("INSERT OR IGNORE INTO learners VALUES (?, ?, ?, ?, ?, ?)", [(l["id"], l.get("name"), l.get("company_id"), str(l["cohort_id"]), l.get("role"), l.get("level")) for l in data.get("learners", [])])
+        conn.executemany("INSERT INTO attendance VALUES (?, ?, ?, ?)", [(a["learner_id"], str(a["cohort_id"]), a.get("status"), _iso(a)) for a in data.get("attendance", [])])
+        conn.executemany("INSERT INTO assessments VALUES (?, ?, ?, ?, ?, ?)", [(a["learner_id"], str(a["cohort_id"]), a.get("type"), a["score"], int(bool(a.get("submitted", False))), _iso(a)) for a in data.get("assessments", [])])
+        conn.executemany("INSERT INTO satisfaction VALUES (?, ?, ?, ?, ?)", [(s["learner_id"], str(s["cohort_id"]), s["rating"], s.get("text"), _iso(s)) for s in data.get("satisfaction", [])])
+        modules = data.get("modules", [])
+        conn.executemany("INSERT INTO modules VALUES (?, ?, ?, ?, ?)", [(i, m.get("id"), m.get("level"), m.get("duration_hours", 2), json.dumps(m, ensure_ascii=False)) for i, m in enumerate(modules)])
+        conn.executemany("INSERT INTO module_tags VALUES (?, ?)", [(i, t) for i, m in enumerate(modules) for t in {t.lower() for t in m.get("tags", [])}])
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _iso(row: dict) -> Optional[str]:
+    d = event_date(row)
+    return d.isoformat() if d else None
+
+
+def _placeholders(n: int) -> str:
+    return ",".join("?" * n)
+
+
+class SqliteStore(OpsStore):
+    """Store backed by a SQLite database; filtering and aggregation run as indexed SQL.
+
+    Only the small companies/cohorts tables are held in memory (for cohort
+    selection); learners and event rows are read as GROUP BY results.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        companies = [{"id": r[0], "name": r[1]} for r in self.conn.execute("SELECT id, name FROM companies")]
+        cohorts = [dict(zip(("id", "company_id", "name", "start_at", "end_at"), r)) for r in self.conn.execute("SELECT id, company_id, name, start_at, end_at FROM cohorts ORDER BY rowid")]
+        super().__init__({"companies": companies, "cohorts": cohorts})
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # One connection per process: forked workers must not share the parent's handle.
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._conn
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_pid"] = None
+        return state
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.data:
+            return self.data[key]
+        if key == "modules":
+            return [json.loads(r[0]) for r in self.conn.execute("SELECT doc FROM modules ORDER BY position")]
+        if key == "learners":
+            cols = ("id", "name", "company_id", "cohort_id", "role", "level")
+            return [dict(zip(cols, r)) for r in self.conn.execute(f"SELECT {', '.join(cols)} FROM learners ORDER BY rowid")]
+        raise KeyError(key)
+
+    def _grouped(
+        self, cohort_ids: Optional[List[str]], by_cohort: bool, start: Optional[date] = None, end: Optional[date] = None, learner_ids: Optional[Set[str]] = None
+    ) -> Dict[str, Aggregate]:
+        key = "cohort_id" if by_cohort else "''"
+        if cohort_ids is None:
+            where, params = "", []
+        else:
+            where, params = f"WHERE cohort_id IN ({_placeholders(len(cohort_ids))})", list(cohort_ids)
+        l_where = where
+        if learner_ids is not None:
+            # A temp table instead of IN (?, ...): learner selections can exceed SQLite's bound-parameter limit.
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS selected_learners (id TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM selected_learners")
+            self.conn.executemany("INSERT INTO selected_learners VALUES (?)", ((lid,) for lid in learner_ids))
+            l_where = f"{where} {'AND' if where else 'WHERE'} id IN (SELECT id FROM selected_learners)"
+            where = f"{where} {'AND' if where else 'WHERE'} learner_id IN (SELECT id FROM selected_learners)"
+        # Learners have no date; only the event tables are cut to [start, end).
+        ev_where, ev_params = where, params
+        if start is not None and end is not None:
+            ev_where = f"{where} {'AND' if where else 'WHERE'} date >= ? AND date < ?"
+            ev_params = params + [start.isoformat(), end.isoformat()]
+        aggs: Dict[str, Aggregate] = {}
+
+        def agg_for(k: str) -> Aggregate:
+            a = aggs.get(k)
+            if a is None:
+                a = aggs[k] = Aggregate([k] if by_cohort else cohort_ids or [])
+            return a
+
+        for k, lid in self.conn.execute(f"SELECT {key}, id FROM learners {l_where} ORDER BY rowid", params):
+            agg_for(k).add_learner({"id": lid})
+        for k, lid, total, present in self.conn.execute(
+            f"SELECT {key}, learner_id, COUNT(*), SUM(status = 'present') FROM attendance {ev_where} GROUP BY 1, 2", ev_params
+        ):
+            a = agg_for(k)
+            st = a.stats(lid)
+            st.total += total
+            st.present += present
+            a.att_total += total
+            a.att_present += present
+        # Grouped by value (and its type, so 4 and 4.0 stay apart) too: SQL SUM() rounds as it goes,
+        # so totals are rebuilt exactly from (value, count).
+        for k, lid, score, n, submitted, quiz_n in self.conn.execute(
+            f"SELECT {key}, learner_id, score, COUNT(*), SUM(submitted), SUM(type = 'quiz') FROM assessments {ev_where} GROUP BY 1, 2, 3, typeof(score)",
+            ev_params,
+        ):
+            a = agg_for(k)
+            st = a.stats(lid)
+            st.score_sum.add(score, n)
+            st.score_count += n
+            a.assess_total += n
+            a.submitted += submitted
+            if quiz_n:
+                a.quiz_count += quiz_n
+                a.quiz_sum.add(score, quiz_n)
+        for k, lid, rating, n, promoters, detractors in self.conn.execute(
+            f"SELECT {key}, learner_id, rating, COUNT(*), {_PROMOTER}, {_DETRACTOR} FROM satisfaction {ev_where} GROUP BY 1, 2, 3, typeof(rating)", ev_params
+        ):
+            a = agg_for(k)
+            st = a.stats(lid)
+            st.rating_sum.add(rating, n)
+            st.rating_count += n
+            a.rating_sum.add(rating, n)
+            a.rating_count += n
+            a.promoters += promoters
+            a.detractors += detractors
+        # Distributions come back as (value, count) groups; scores and ratings have few distinct values.
+        quiz_where = f"{ev_where} {'AND' if ev_where else 'WHERE'} type = 'quiz'"
+        for sql, attr in (
+            (f"SELECT {key}, score, COUNT(*) FROM assessments {quiz_where} GROUP BY 1, 2", "quiz_sketch"),
+            (f"SELECT {key}, rating, COUNT(*) FROM satisfaction {ev_where} GROUP BY 1, 2", "rating_sketch"),
+        ):
+            for k, value, n in self.conn.execute(sql, ev_params):
+                getattr(agg_for(k), attr).add(value, n)
+        for a in aggs.values():
+            a.recount()
+        return aggs
+
+    def aggregate(self, cohort_ids: Iterable[str]) -> Aggregate:
+        cohort_ids = list(cohort_ids)
+        if not cohort_ids:
+            return Aggregate()
+        return self._grouped(cohort_ids, by_cohort=False).get("", Aggregate(cohort_ids))
+
+    def aggregate_range(self, cohort_ids: Iterable[str], start: date, end: date) -> Aggregate:
+        cohort_ids = list(cohort_ids)
+        if not cohort_ids:
+            return Aggregate()
+        return self._grouped(cohort_ids, by_cohort=False, start=start, end=end).get("", Aggregate(cohort_ids))
+
+    def aggregate_learners(self, cohort_ids: Iterable[str], learner_ids: Set[str]) -> Aggregate:
+        cohort_ids = list(cohort_ids)
+        if not cohort_ids or not learner_ids:
+            return Aggregate(cohort_ids)
+        return self._grouped(cohort_ids, by_cohort=False, learner_ids=learner_ids).get("", Aggregate(cohort_ids))
+
+    def cohort_aggregates(self) -> Dict[str, Aggregate]:
+        aggs = self._grouped(None, by_cohort=True)
+        return {cid: aggs.get(cid) or Aggregate([cid]) for cid in self.cohorts_by_id}
+
+    def recommend_modules(self, role: str, level: str, duration_weeks: int, tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        tags = sorted({t.lower() for t in (tags or [])})
+        is_pm = role.lower() in ("pm", "product manager")
+        count = max(2, duration_weeks * 2)
+        overlap = (
+            f"(SELECT COUNT(*) FROM module_tags t WHERE t.position = m.position AND t.tag IN ({_placeholders(len(tags))}))"
+            if tags else "0"
+        )
+        sql = (
+            f"SELECT doc FROM modules m "
+            f"ORDER BY (CASE WHEN m.level = ? THEN 2 ELSE 0 END) + {overlap} "
+            f"+ (CASE WHEN ? AND EXISTS (SELECT 1 FROM module_tags t WHERE t.position = m.position AND t.tag = 'pm') THEN 1 ELSE 0 END) DESC, "
+            f"m.position LIMIT ?"
+        )
+        rows = self.conn.execute(sql, [level, *tags, int(is_pm), count]).fetchall()
+        picked = [json.loads(doc) for (doc,) in rows]
+        total_hours = sum(m.get("duration_hours", 2) for m in picked)
+        return {"role": role, "level": level, "weeks": duration_weeks, "modules": picked, "total_hours": total_hours}
+
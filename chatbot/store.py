@@ -0,0 +1,137 @@
+from collections import defaultdict
+from datetime import date
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+
+from chatbot.aggregate import Aggregate, build_aggregate
+from chatbot.catalog import ModuleCatalog
+from chatbot.query import QueryIndex
+from chatbot.timeline import TimeIndex
+
+
+EVENT_TABLES = ("attendance", "assessments", "satisfaction")
+
+
+class OpsStore:
+    """Seed dataset with per-cohort, per-company and per-learner indexes.
+
+    Built once from ``load_data()``; cohort queries then only touch that
+    cohort's rows instead of scanning every table. Item access is delegated
+    to the raw dict so existing ``data["modules"]``-style code keeps working.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+        self.cohorts_by_id: Dict[str, dict] = {}
+        self.cohorts_by_company: Dict[str, List[str]] = defaultdict(list)
+        for c in data.get("cohorts", []):
+            cid = str(c["id"])
+            self.cohorts_by_id[cid] = c
+            self.cohorts_by_company[str(c.get("company_id"))].append(cid)
+
+        self.learners_by_id: Dict[str, dict] = {}
+        self.learners_by_cohort: Dict[str, List[dict]] = defaultdict(list)
+        for l in data.get("learners", []):
+            self.learners_by_id[str(l["id"])] = l
+            self.learners_by_cohort[str(l["cohort_id"])].append(l)
+
+        self.by_cohort: Dict[str, Dict[str, List[dict]]] = {}
+        self.by_learner: Dict[str, Dict[str, List[dict]]] = {}
+        for table in EVENT_TABLES:
+            per_cohort: Dict[str, List[dict]] = defaultdict(list)
+            per_learner: Dict[str, List[dict]] = defaultdict(list)
+            for r in data.get(table, []):
+                per_cohort[str(r["cohort_id"])].append(r)
+                per_learner[str(r["learner_id"])].append(r)
+            self.by_cohort[table] = per_cohort
+            self.by_learner[table] = per_learner
+        self._catalog: Optional[ModuleCatalog] = None
+        self._timeline: Optional[TimeIndex] = None
+        self._query_index: Optional[QueryIndex] = None
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    @property
+    def catalog(self) -> ModuleCatalog:
+        if self._catalog is None:
+            self._catalog = ModuleCatalog(self["modules"])
+        return self._catalog
+
+    @property
+    def timeline(self) -> TimeIndex:
+        if self._timeline is None:
+            self._timeline = TimeIndex(self)
+        return self._timeline
+
+    @property
+    def query_index(self) -> QueryIndex:
+        if self._query_index is None:
+            self._query_index = QueryIndex(self)
+        return self._query_index
+
+    def select_cohorts(self, company_id: Optional[str] = None, cohort_id: Optional[str] = None) -> List[str]:
+        if cohort_id:
+            cid = str(cohort_id)
+            c = self.cohorts_by_id.get(cid)
+            if c is None or (company_id and str(c.get("company_id")) != str(company_id)):
+                return []
+            return [cid]
+        if company_id:
+            return list(self.cohorts_by_company.get(str(company_id), []))
+        return list(self.cohorts_by_id)
+
+    def rows(self, table: str, cohort_ids: Iterable[str]) -> Iterator[dict]:
+        index = self.by_cohort[table]
+        return chain.from_iterable(index.get(cid, ()) for cid in cohort_ids)
+
+    def learners(self, cohort_ids: Iterable[str]) -> Iterator[dict]:
+        return chain.from_iterable(self.learners_by_cohort.get(cid, ()) for cid in cohort_ids)
+
+    def aggregate(self, cohort_ids: Iterable[str]) -> Aggregate:
+        return build_aggregate(self, cohort_ids)
+
+    def aggregate_learners(self, cohort_ids: Iterable[str], learner_ids: Set[str]) -> Aggregate:
+        """Aggregate restricted to ``learner_ids``: their roster entries and events, via the per-learner index."""
+        cohort_ids = list(cohort_ids)
+        selected = set(cohort_ids)
+        agg = Aggregate(cohort_ids)
+        for l in self.learners(cohort_ids):
+            if str(l["id"]) in learner_ids:
+                agg.add_learner(l)
+        # Sorted so float sums do not depend on set iteration order.
+        ordered = sorted(learner_ids)
+        for table, add in (("attendance", Aggregate.add_attendance), ("assessments", Aggregate.add_assessment), ("satisfaction", Aggregate.add_satisfaction)):
+            index = self.by_learner[table]
+            for lid in ordered:
+                for r in index.get(lid, ()):
+                    if str(r["cohort_id"]) in selected:
+                        add(agg, r)
+        return agg
+
+    def aggregate_range(self, cohort_ids: Iterable[str], start: date, end: date) -> Aggregate:
+        return self.timeline.aggregate(cohort_ids, start, end)
+
+    def cohort_aggregates(self) -> Dict[str, Aggregate]:
+        # One pass over every table, routing each row to its cohort's counters.
+        aggs = {cid: Aggregate([cid]) for cid in self.cohorts_by_id}
+        for l in self.data.get("learners", []):
+            agg = aggs.get(str(l["cohort_id"]))
+            if agg is not None:
+                agg.add_learner(l)
+        for table, add in (("attendance", Aggregate.add_attendance), ("assessments", Aggregate.add_assessment), ("satisfaction", Aggregate.add_satisfaction)):
+            for r in self.data.get(table, []):
+                agg = aggs.get(str(r["cohort_id"]))
+                if agg is not None:
+                    add(agg, r)
+        return aggs
+
+    def learner_rows(self, table: str, learner_id: str) -> List[dict]:
+        return self.by_learner[table].get(str(learner_id), [])
+
+
+def as_store(data: Any) -> OpsStore:
+    return OpsStore(data) if isinstance(data, dict) else data
@@ -0,0 +1,261 @@
+import glob
+import gzip
+import json
+import os
+import sys
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from chatbot.aggregate import Aggregate
+from chatbot.core import load_data
+from chatbot.store import EVENT_TABLES, OpsStore
+from chatbot.timeline import event_date
+from chatbot.trace import span
+
+
+KIND_ALIASES = {
+    "attendance": "attendance",
+    "assessment": "assessments",
+    "assessments": "assessments",
+    "quiz": "assessments",
+    "assignment": "assessments",
+    "satisfaction": "satisfaction",
+    "survey": "satisfaction",
+    "learner": "learners",
+    "learners": "learners",
+}
+
+
+def event_kind(row: dict) -> Optional[str]:
+    kind = row.get("kind") or row.get("table")
+    if kind:
+        return KIND_ALIASES.get(str(kind).lower())
+    # LMS exports without an explicit kind: infer from the payload fields
+    if "status" in row:
+        return "attendance"
+    if "rating" in row:
+        return "satisfaction"
+    if "score" in row:
+        return "assessments"
+    return None
+
+
+def expand_paths(paths: Union[str, Iterable[str]]) -> List[str]:
+    if isinstance(paths, str):
+        paths = [paths]
+    out: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            out.extend(sorted(glob.glob(os.path.join(p, "*.jsonl")) + glob.glob(os.path.join(p, "*.jsonl.gz"))))
+        else:
+            out.extend(sorted(glob.glob(p)) or [p])
+    return out
+
+
+def iter_jsonl(paths: Union[str, Iterable[str]]) -> Iterator[dict]:
+    # "-" reads stdin, so a live feed can be piped in (e.g. `tail -f export.jsonl`).
+    for p in expand_paths(paths):
+        if p == "-":
+            yield from _iter_lines(sys.stdin)
+            continue
+        opener = gzip.open if p.endswith(".gz") else open
+        with opener(p, "rt", encoding="utf-8") as f:
+            yield from _iter_lines(f)
+
+
+def _iter_lines(f: Any) -> Iterator[dict]:
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class JsonlTail:
+    """Polls one JSON Lines file for rows appended since the previous ``read``.
+
+    Only the new bytes are read; a trailing line still being written is held
+    back until its newline arrives. When the file shrinks (truncated or
+    rotated to a new file) reading restarts at the top and ``resets`` is incremented, so
+    callers can rebuild whatever they folded the old rows into.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.offset = 0
+        self.resets = 0
+        self._partial = b""
+        self._inode: Optional[int] = None
+
+    def read(self) -> List[dict]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return []
+        size = st.st_size
+        if size < self.offset or (self._inode is not None and st.st_ino != self._inode):
+            self.offset = 0
+            self._partial = b""
+            self.resets += 1
+        self._inode = st.st_ino
+        if size == self.offset:
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+        self.offset += len(chunk)
+        lines = (self._partial + chunk).split(b"\n")
+        self._partial = lines.pop()
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+REFERENCE_TABLES = ("companies", "cohorts", "learners", "modules")
+
+
+def _table(reference: Any, table: str) -> Iterable[dict]:
+    if reference is None:
+        return []
+    try:
+        return reference[table]
+    except KeyError:
+        return []
+
+
+class StreamingStore(OpsStore):
+    """OpsStore whose event tables are folded into per-cohort counters on ingest.
+
+    Raw attendance/assessment/satisfaction rows are never kept, so memory is
+    bounded by the number of cohorts and learners rather than by the number of
+    events. ``apply_event`` keeps the counters (including NPS buckets and
+    completion flags) current as events arrive, so KPIs and risk rankings can
+    be read at any time without recomputation. ``compute_kpis``/``risk_scores``/
+    ``weekly_report``/``generate_aar`` accept it like any other store.
+
+    Dated events are also folded into per-(cohort, day) counters, so date
+    ranges and ``weekly --week`` are answered by merging at most one bucket
+    per day in the range.
+    """
+
+    def __init__(self, reference: Any = None):
+        # ``reference`` may be a seed dict or any store (SqliteStore included); only its reference
+        # tables are read, and they are copied so added learners never touch the caller's lists.
+        super().__init__({table: list(_table(reference, table)) for table in REFERENCE_TABLES})
+        self.cohort_aggs: Dict[str, Aggregate] = {}
+        self.cohort_days: Dict[str, Dict[int, Aggregate]] = {}
+        for cid, learners in self.learners_by_cohort.items():
+            agg = self._cohort(cid)
+            for l in learners:
+                agg.add_learner(l)
+        self.events = 0
+
+    def _cohort(self, cohort_id: str) -> Aggregate:
+        agg = self.cohort_aggs.get(cohort_id)
+        if agg is None:
+            agg = self.cohort_aggs[cohort_id] = Aggregate([cohort_id])
+        return agg
+
+    def _add_learner(self, learner: dict) -> None:
+        cid = str(learner["cohort_id"])
+        self.learners_by_id[str(learner["id"])] = learner
+        self.learners_by_cohort[cid].append(learner)
+        self.data["learners"].append(learner)
+        self._query_index = None
+        self._cohort(cid).add_learner(learner)
+
+    @classmethod
+    def from_data(cls, data: Any) -> "StreamingStore":
+        store = cls(data)
+        for table in EVENT_TABLES:
+            store.ingest(data.get(table, []), kind=table)
+        return store
+
+    @classmethod
+    def from_store(cls, source: OpsStore) -> "StreamingStore":
+        """Counters seeded from ``source.cohort_aggregates()`` rather than from event rows.
+
+        Works for stores that keep no rows in memory (SqliteStore). Day buckets
+        are not seeded, so date ranges only see events applied afterwards.
+        """
+        store = cls(source)
+        for cid, agg in source.cohort_aggregates().items():
+            store.cohort_aggs[cid] = agg
+            store.events += agg.att_total + agg.assess_total + agg.rating_count
+        return store
+
+    def apply_event(self, event: dict, kind: Optional[str] = None) -> Optional[str]:
+        """Fold one event into the live counters in O(1); returns the touched cohort id."""
+        kind = kind or event_kind(event)
+        if kind == "learners":
+            self._add_learner(event)
+            return str(event["cohort_id"])
+        if kind is None:
+            return None
+        cid = str(event["cohort_id"])
+        if kind == "attendance":
+            add = Aggregate.add_attendance
+        elif kind == "assessments":
+            add = Aggregate.add_assessment
+        else:
+            add = Aggregate.add_satisfaction
+        add(self._cohort(cid), event)
+        d = event_date(event)
+        if d is not None:
+            days = self.cohort_days.setdefault(cid, {})
+            bucket = days.get(d.toordinal())
+            if bucket is None:
+                bucket = days[d.toordinal()] = Aggregate([cid])
+            add(bucket, event)
+        self.events += 1
+        return cid
+
+    def ingest(self, rows: Iterable[dict], kind: Optional[str] = None) -> int:
+        before = self.events
+        for row in rows:
+            self.apply_event(row, kind)
+        return self.events - before
+
+    def kpis(self, company_id: Optional[str] = None, cohort_id: Optional[str] = None) -> Dict[str, Any]:
+        return self.aggregate(self.select_cohorts(company_id=company_id, cohort_id=cohort_id)).kpis()
+
+    def risks(self, cohort_id: str, top: Optional[int] = None) -> List[Tuple[str, float, Dict[str, Any]]]:
+        rows = self.aggregate([str(cohort_id)]).risks()
+        return rows if top is None else rows[:top]
+
+    def aggregate_range(self, cohort_ids: Iterable[str], start: date, end: date) -> Aggregate:
+        cohort_ids = list(cohort_ids)
+        out = Aggregate(cohort_ids)
+        for l in self.learners(cohort_ids):
+            out.add_learner(l)
+        lo, hi = start.toordinal(), end.toordinal()
+        for cid in cohort_ids:
+            days = self.cohort_days.get(cid, {})
+            for day in sorted(days) if len(days) < hi - lo else range(lo, hi):
+                if lo <= day < hi and day in days:
+                    out.merge(days[day], recount=False)
+        return out.recount()
+
+    def aggregate_learners(self, cohort_ids: Iterable[str], learner_ids: Set[str]) -> Aggregate:
+        # Streamed events are folded into counters as they arrive; nothing is left to re-filter per learner.
+        raise ValueError("learner filters (learner/role/level) need stored event rows; they are not available with --events")
+
+    def cohort_aggregates(self) -> Dict[str, Aggregate]:
+        return {cid: self.cohort_aggs.get(cid) or Aggregate([cid]) for cid in self.cohorts_by_id}
+
+    def aggregate(self, cohort_ids: Iterable[str]) -> Aggregate:
+        cohort_ids = list(cohort_ids)
+        if len(cohort_ids) == 1 and cohort_ids[0] in self.cohort_aggs:
+            # Live counters are read in place; KPIs for one cohort cost O(1).
+            return self.cohort_aggs[cohort_ids[0]]
+        out = Aggregate()
+        for cid in cohort_ids:
+            out.cohort_ids.add(cid)
+            agg = self.cohort_aggs.get(cid)
+            if agg is not None:
+                out.merge(agg, recount=False)
+        return out.recount()
+
+
+def load_streaming(events: Union[str, Iterable[str]], reference_path: Optional[str] = None) -> StreamingStore:
+    store = StreamingStore(load_data(reference_path))
+    with span("load.events"):
+        store.ingest(iter_jsonl(events))
+    return store
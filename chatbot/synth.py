@@ -0,0 +1,165 @@
+import argparse
+import json
+import random
+import tempfile
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from chatbot.store import EVENT_TABLES
+
+
+ROLES = ["PM", "DA", "DE", "Marketing", "HR"]
+LEVELS = ["junior", "mid", "senior"]
+TAGS = ["pm", "data", "sql", "python", "viz", "metrics", "experiment", "ai", "automation", "foundation", "leadership", "ops"]
+TABLES = ("companies", "cohorts", "learners", "attendance", "assessments", "satisfaction", "modules")
+FEEDBACK = ["만족", "좋아요", "속도가 빨라요", "어려움", "실습이 더 필요해요", "아주 좋음"]
+
+
+def _learner_profile(rng: random.Random) -> Tuple[float, float, float]:
+    # Per-learner tendencies so risk scores spread out instead of clustering.
+    return rng.betavariate(6, 1.5), rng.gauss(72, 15), rng.gauss(3.9, 0.7)
+
+
+def iter_dataset(
+    companies: int = 2,
+    cohorts_per_company: int = 2,
+    learners_per_cohort: int = 20,
+    events_per_learner: int = 10,
+    modules: int = 50,
+    seed: int = 0,
+) -> Iterator[Tuple[str, dict]]:
+    """Yield (table, row) pairs of a deterministic seed-format dataset.
+
+    ``events_per_learner`` is split roughly 50/40/10 across attendance,
+    assessments and satisfaction. Generation is streaming, so datasets larger
+    than memory can be written straight to disk.
+    """
+    rng = random.Random(seed)
+    for m in range(modules):
+        yield "modules", {
+            "id": f"M{m + 1}",
+            "topic": f"Module {m + 1}",
+            "level": rng.choice(LEVELS),
+            "duration_hours": rng.choice([1, 2, 2, 3, 3, 4]),
+            "tags": rng.sample(TAGS, rng.randint(1, 3)),
+        }
+    n_att = max(1, events_per_learner * 5 // 10)
+    n_assess = max(1, events_per_learner * 4 // 10)
+    n_sat = max(0, events_per_learner - n_att - n_assess)
+    lid = 0
+    for c in range(companies):
+        company_id = f"C{c + 1}"
+        yield "companies", {"id": company_id, "name": f"Company {c + 1}"}
+        for h in range(cohorts_per_company):
+            cohort_id = f"{company_id}-{h + 1}"
+            month = 1 + (h % 12)
+            start = date(2025, month, 1)
+            yield "cohorts", {
+                "id": cohort_id,
+                "company_id": company_id,
+                "name": f"{company_id} Track {h + 1}",
+                "start_at": f"2025-{month:02d}-01",
+                "end_at": f"2025-{month:02d}-28",
+            }
+            for _ in range(learners_per_cohort):
+                lid += 1
+                learner_id = f"L{lid}"
+                yield "learners", {"id": learner_id, "name": f"Learner {lid}", "company_id": company_id, "cohort_id": cohort_id, "role": rng.choice(ROLES), "level": rng.choice(LEVELS)}
+                p_present, score_mu, rating_mu = _learner_profile(rng)
+                # Events are spread evenly over the cohort's four weeks (dates don't consume randomness).
+                for k in range(n_att):
+                    day = (start + timedelta(days=k * 27 // n_att)).isoformat()
+                    yield "attendance", {"learner_id": learner_id, "cohort_id": cohort_id, "status": "present" if rng.random() < p_present else "absent", "date": day}
+                for k in range(n_assess):
+                    kind = "quiz" if rng.random() < 0.5 else "assignment"
+                    score = int(min(100, max(0, rng.gauss(score_mu, 10))))
+                    day = (start + timedelta(days=(k * 27 // n_assess) + 2)).isoformat()
+                    yield "assessments", {"learner_id": learner_id, "cohort_id": cohort_id, "type": kind, "score": score, "submitted": rng.random() < 0.85, "date": day}
+                for k in range(n_sat):
+                    rating = round(min(5.0, max(1.0, rng.gauss(rating_mu, 0.5))) * 2) / 2
+                    day = (start + timedelta(days=(k * 27 // n_sat) + 4)).isoformat()
+                    yield "satisfaction", {"learner_id": learner_id, "cohort_id": cohort_id, "rating": rating, "text": rng.choice(FEEDBACK), "date": day}
+
+
+def generate(**kwargs: Any) -> Dict[str, Any]:
+    data: Dict[str, Any] = {t: [] for t in TABLES}
+    for table, row in iter_dataset(**kwargs):
+        data[table].append(row)
+    return data
+
+
+def write_dataset(out: str, events_out: Optional[str] = None, **kwargs: Any) -> Dict[str, int]:
+    """Write seed-format JSON; with ``events_out`` events go to a JSON Lines file instead.
+
+    Only the small reference tables are buffered in memory; event rows are
+    written out as they are generated.
+    """
+    counts = {t: 0 for t in TABLES}
+    if events_out:
+        reference: Dict[str, Any] = {t: [] for t in TABLES if t not in EVENT_TABLES}
+        with open(events_out, "w", encoding="utf-8") as ev:
+            for table, row in iter_dataset(**kwargs):
+                counts[table] += 1
+                if table in EVENT_TABLES:
+                    ev.write(json.dumps(dict(row, kind=table), ensure_ascii=False) + "\n")
+                else:
+                    reference[table].append(row)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(reference, f, ensure_ascii=False)
+        return counts
+
+    # Seed format groups rows by table: event rows are spooled per table to temp files, then stitched.
+    spools = {t: tempfile.TemporaryFile("w+", encoding="utf-8") for t in EVENT_TABLES}
+    reference = {t: [] for t in TABLES if t not in EVENT_TABLES}
+    try:
+        for table, row in iter_dataset(**kwargs):
+            counts[table] += 1
+            if table in spools:
+                spools[table].write(json.dumps(row, ensure_ascii=False) + "\n")
+            else:
+                reference[table].append(row)
+        with open(out, "w", encoding="utf-8") as f:
+            f.write("{")
+            for n, table in enumerate(TABLES):
+                f.write(("," if n else "") + f"\n  {json.dumps(table)}: [")
+                if table in spools:
+                    spools[table].seek(0)
+                    rows: Iterable[str] = (line.rstrip("\n") for line in spools[table])
+                else:
+                    rows = (json.dumps(r, ensure_ascii=False) for r in reference[table])
+                for i, line in enumerate(rows):
+                    f.write(("" if i == 0 else ",") + "\n    " + line)
+                f.write("\n  ]")
+            f.write("\n}\n")
+    finally:
+        for sp in spools.values():
+            sp.close()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Deterministic synthetic training-ops data (seed.json format)")
+    parser.add_argument("--out", required=True, help="Output JSON path")
+    parser.add_argument("--events-out", dest="events_out", default=None, help="Write events to this JSON Lines file (for --events streaming)")
+    parser.add_argument("--companies", type=int, default=10)
+    parser.add_argument("--cohorts-per-company", dest="cohorts_per_company", type=int, default=5)
+    parser.add_argument("--learners-per-cohort", dest="learners_per_cohort", type=int, default=30)
+    parser.add_argument("--events-per-learner", dest="events_per_learner", type=int, default=20)
+    parser.add_argument("--modules", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    counts = write_dataset(
+        args.out,
+        events_out=args.events_out,
+        companies=args.companies,
+        cohorts_per_company=args.cohorts_per_company,
+        learners_per_cohort=args.learners_per_cohort,
+        events_per_learner=args.events_per_learner,
+        modules=args.modules,
+        seed=args.seed,
+    )
+    print(json.dumps(counts, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
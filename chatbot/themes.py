@@ -0,0 +1,115 @@
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+# Retro feedback themes -> keywords (matched case-insensitively as substrings).
+THEMES: Dict[str, Tuple[str, ...]] = {
+    "난이도": ("난이도", "어렵", "어려웠", "어려움", "쉬웠", "너무 쉬", "수준 차이"),
+    "실습": ("실습", "핸즈온", "hands-on", "예제"),
+    "시간": ("시간 부족", "시간이 부족", "시간 확장", "시간확장", "연장", "빠듯", "짧았"),
+    "강사": ("강사", "튜터", "설명", "피드백 속도"),
+    "환경": ("접속", "환경 설정", "설치", "권한", "네트워크", "사내망", "vpn"),
+    "과제": ("과제", "마감", "제출"),
+    "만족": ("유익", "만족", "좋았", "추천"),
+}
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: every occurrence of every pattern in one pass over the text.
+
+    The trie, failure links and transition table are built once; matching
+    is O(len(text) + matches) however many patterns there are, instead of
+    one substring scan per keyword.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: List[str] = [p.lower() for p in patterns]
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[Tuple[int, ...]] = [()]
+        for i, p in enumerate(self.patterns):
+            if not p:
+                continue
+            state = 0
+            for ch in p:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = self.goto[state][ch] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(())
+                state = nxt
+            self.out[state] += (i,)
+        # Breadth-first, so a state's failure target is final before its children need it.
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                if state:
+                    f = self.fail[state]
+                    while f and ch not in self.goto[f]:
+                        f = self.fail[f]
+                    self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] += self.out[self.fail[nxt]]
+        # Fold the failure links into a full transition table (a DFA), so matching does one
+        # dict lookup per character; characters outside the patterns fall back to the root.
+        self.delta: List[Dict[str, int]] = [dict(self.goto[0])] + [{} for _ in range(len(self.goto) - 1)]
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            table = dict(self.delta[self.fail[state]])
+            table.update(self.goto[state])
+            self.delta[state] = table
+            queue.extend(self.goto[state].values())
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(start offset, pattern index) of every match, in order of match end."""
+        delta, out, patterns = self.delta, self.out, self.patterns
+        state = 0
+        for pos, ch in enumerate(text.lower()):
+            state = delta[state].get(ch, 0)
+            for i in out[state]:
+                yield pos - len(patterns[i]) + 1, i
+
+    def matches(self, text: str) -> Set[int]:
+        """Indices of the patterns that occur in ``text``."""
+        delta, out = self.delta, self.out
+        found: Set[int] = set()
+        state = 0
+        for ch in text.lower():
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class ThemeMatcher:
+    """Tags free text with themes via one ``AhoCorasick`` over all theme keywords."""
+
+    def __init__(self, themes: Dict[str, Iterable[str]]):
+        self.themes: List[str] = list(themes)
+        keywords: List[str] = []
+        self.theme_of: List[int] = []
+        for t, words in enumerate(themes.values()):
+            for w in words:
+                keywords.append(w)
+                self.theme_of.append(t)
+        self.automaton = AhoCorasick(keywords)
+
+    def theme_ids(self, text: str) -> Set[int]:
+        return {self.theme_of[i] for i in self.automaton.matches(text or "")}
+
+    def themes_in(self, text: str) -> List[str]:
+        """Themes present in ``text``, in ``THEMES`` order."""
+        ids = self.theme_ids(text)
+        return [t for i, t in enumerate(self.themes) if i in ids]
+
+    def keywords_in(self, text: str) -> List[str]:
+        patterns = self.automaton.patterns
+        return sorted({patterns[i] for i in self.automaton.matches(text or "")})
+
+
+@lru_cache(maxsize=1)
+def default_matcher() -> ThemeMatcher:
+    return ThemeMatcher(THEMES)
@@ -0,0 +1,247 @@
+from bisect import bisect_left
+from itertools import accumulate
+from operator import itemgetter
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from chatbot.aggregate import Aggregate, ExactSum, nps_bucket
+from chatbot.sketch import QuantileSketch
+
+
+# Event fields checked, in order, for the event's date (ISO date or datetime string).
+DATE_FIELDS = ("date", "timestamp")
+
+
+def parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def event_date(row: dict) -> Optional[date]:
+    for field in DATE_FIELDS:
+        value = row.get(field)
+        if value:
+            return parse_date(value)
+    return None
+
+
+def week_bounds(cohort: dict, week: int) -> Tuple[date, date]:
+    """[start, end) of week ``week`` (1-based), counted from the cohort's ``start_at``."""
+    if week < 1:
+        raise ValueError(f"week must be >= 1, got {week}")
+    if not cohort.get("start_at"):
+        raise ValueError(f"cohort {cohort.get('id')!r} has no start_at; weeks count from it")
+    start = parse_date(cohort["start_at"]) + timedelta(weeks=week - 1)
+    return start, start + timedelta(days=7)
+
+
+def _scaled(values: List[Any]) -> Tuple[List[int], int]:
+    """Ints ``n`` and a shift with ``values[i] == n[i] / 2**shift`` exactly (floats are dyadic)."""
+    ratios = [v.as_integer_ratio() if isinstance(v, float) else (v, 1) for v in values]
+    shift = max((d.bit_length() - 1 for _, d in ratios), default=0)
+    return [n << (shift - d.bit_length() + 1) for n, d in ratios], shift
+
+
+class PrefixSeries:
+    """Date-sorted values with running totals; any [start, end) sum is two bisects and a subtraction.
+
+    Values are ints, so the running totals (and every range sum) are exact.
+    """
+
+    __slots__ = ("days", "sums")
+
+    def __init__(self, items: List[Tuple[Any, ...]], width: int):
+        # items are (day ordinal, value_1, ..., value_width); sorting is cheap as events mostly arrive in date order.
+        items.sort(key=itemgetter(0))
+        columns = list(zip(*items)) or [()] * (width + 1)
+        self.days = list(columns[0])
+        self.sums: List[List[int]] = [list(accumulate(col, initial=0)) for col in columns[1:]]
+
+    def range(self, start: int, end: int) -> Tuple[int, List[int]]:
+        i = bisect_left(self.days, start)
+        j = bisect_left(self.days, end)
+        return j - i, [s[j] - s[i] for s in self.sums]
+
+
+class LearnerPrefix:
+    """Per-learner running (count, scaled sum, float count) of one table, sparse in time.
+
+    Each learner keeps running totals only at its own distinct event days,
+    so memory grows with the number of events, not with days x learners. A
+    [start, end) range is two bisects per learner with events, which
+    building the roster visits anyway.
+    """
+
+    __slots__ = ("series",)
+
+    def __init__(self, rows: List[Tuple[int, str, int, bool]]):
+        # rows are (day ordinal, learner id, scaled value, value was a float), in any order.
+        rows.sort(key=itemgetter(0))
+        # learner id -> (days, counts, sums, floats); the running lists start with a 0 before the first day.
+        self.series: Dict[str, Tuple[List[int], List[int], List[int], List[int]]] = {}
+        for day, lid, value, is_float in rows:
+            s = self.series.get(lid)
+            if s is None:
+                s = self.series[lid] = ([], [0], [0], [0])
+            days, counts, sums, floats = s
+            if days and days[-1] == day:
+                counts[-1] += 1
+                sums[-1] += value
+                floats[-1] += is_float
+            else:
+                days.append(day)
+                counts.append(counts[-1] + 1)
+                sums.append(sums[-1] + value)
+                floats.append(floats[-1] + is_float)
+
+    def range(self, start: int, end: int) -> Iterator[Tuple[str, int, int, int]]:
+        """(learner id, count, scaled sum, float count) of learners with events in [start, end)."""
+        for lid, (days, counts, sums, floats) in self.series.items():
+            if days[0] >= end or days[-1] < start:
+                continue
+            i = bisect_left(days, start)
+            j = bisect_left(days, end)
+            if i != j:
+                yield lid, counts[j] - counts[i], sums[j] - sums[i], floats[j] - floats[i]
+
+
+def _attendance(row: dict) -> Tuple[int]:
+    return (int(row.get("status") == "present"),)
+
+
+def _assessment(row: dict) -> Tuple[Any, int, int, Any]:
+    quiz = row.get("type") == "quiz"
+    return row["score"], int(bool(row.get("submitted", False))), int(quiz), row["score"] if quiz else 0
+
+
+def _satisfaction(row: dict) -> Tuple[Any, int, int]:
+    bucket = nps_bucket(row["rating"])
+    return row["rating"], int(bucket > 0), int(bucket < 0)
+
+
+# table -> (row -> values, width); learner series only need the first value of each.
+_FIELDS = {"attendance": (_attendance, 1), "assessments": (_assessment, 4), "satisfaction": (_satisfaction, 3)}
+# Value columns (by position) that may hold floats: scaled to ints, with float counts appended as extra columns.
+_EXACT = {"assessments": (0, 3), "satisfaction": (0,)}
+# table -> (values -> sketched value or None, Aggregate sketch attribute): quiz scores and ratings, one sketch per day.
+_SKETCHED = {"assessments": (lambda v: v[0] if v[2] else None, "quiz_sketch"), "satisfaction": (lambda v: v[0], "rating_sketch")}
+# table -> (LearnerStats count field, LearnerStats sum field)
+_LEARNER_FIELDS = {"attendance": ("total", "present"), "assessments": ("score_count", "score_sum"), "satisfaction": ("rating_count", "rating_sum")}
+
+
+class CohortTimeline:
+    """Prefix-sum series of one cohort's dated events: cohort-wide and per learner.
+
+    Cohort counters for any date range come from one series per table in
+    O(log n). Per-learner stats (for completion and risk) come from one
+    sparse ``LearnerPrefix`` per table: two bisects per learner, which
+    building the roster visits anyway. Score
+    and rating sums are scaled to ints, so ranges are exact. Score
+    distributions merge one sketch per day in the range. Events without a
+    date are not indexed.
+    """
+
+    def __init__(self, rows_by_table: Dict[str, Iterable[dict]]):
+        self.cohort: Dict[str, PrefixSeries] = {}
+        self.learners: Dict[str, LearnerPrefix] = {}
+        self.shifts: Dict[str, int] = {}
+        self.sketches: Dict[str, Tuple[List[int], List[QuantileSketch]]] = {}
+        ordinals: Dict[Any, int] = {}
+        for table, (values, width) in _FIELDS.items():
+            days: List[int] = []
+            lids: List[str] = []
+            cols: List[List[Any]] = [[] for _ in range(width)]
+            sketched = _SKETCHED.get(table, (None,))[0]
+            day_sketches: Dict[int, QuantileSketch] = {}
+            for r in rows_by_table.get(table, ()):
+                raw = r.get("date") or r.get("timestamp")  # DATE_FIELDS, unrolled for the hot loop
+                if not raw:
+                    continue
+                day = ordinals.get(raw)
+                if day is None:
+                    # Events share few distinct dates; parse each once.
+                    day = ordinals[raw] = parse_date(raw).toordinal()
+                v = values(r)
+                days.append(day)
+                lids.append(r["learner_id"])
+                for c, x in zip(cols, v):
+                    c.append(x)
+                if sketched is not None:
+                    x = sketched(v)
+                    if x is not None:
+                        sk = day_sketches.get(day)
+                        if sk is None:
+                            sk = day_sketches[day] = QuantileSketch()
+                        sk.add(x)
+            flags = [isinstance(x, float) for x in cols[0]] if table in _EXACT else [False] * len(days)
+            scaled = {c: _scaled(cols[c]) for c in _EXACT.get(table, ())}
+            # One shift per table, so cohort and learner sums (and score/quiz columns) share a scale.
+            shift = self.shifts[table] = max((sh for _, sh in scaled.values()), default=0)
+            for c, (nums, sh) in scaled.items():
+                cols[c] = [n << (shift - sh) for n in nums]
+            if table == "assessments":
+                # Float counts of scores and of quiz scores, for statistics.mean-style result types.
+                cols += [[int(f) for f in flags], [int(f and q) for f, q in zip(flags, cols[2])]]
+            elif table == "satisfaction":
+                cols.append([int(f) for f in flags])
+            self.cohort[table] = PrefixSeries([(d, *vs) for d, *vs in zip(days, *cols)], len(cols))
+            self.learners[table] = LearnerPrefix(list(zip(days, lids, cols[0], flags)))
+            if sketched is not None:
+                ordered = sorted(day_sketches)
+                self.sketches[table] = (ordered, [day_sketches[d] for d in ordered])
+
+    def add_to(self, agg: Aggregate, start: int, end: int) -> None:
+        n, (present,) = self.cohort["attendance"].range(start, end)
+        agg.att_total += n
+        agg.att_present += present
+        shift = self.shifts["assessments"]
+        n, (_, submitted, quiz_n, quiz_sum, _, quiz_floats) = self.cohort["assessments"].range(start, end)
+        agg.assess_total += n
+        agg.submitted += submitted
+        agg.quiz_count += quiz_n
+        agg.quiz_sum += ExactSum(quiz_sum, shift, quiz_floats > 0)
+        n, (rating_sum, promoters, detractors, rating_floats) = self.cohort["satisfaction"].range(start, end)
+        agg.rating_count += n
+        agg.rating_sum += ExactSum(rating_sum, self.shifts["satisfaction"], rating_floats > 0)
+        agg.promoters += promoters
+        agg.detractors += detractors
+        for table, (_, attr) in _SKETCHED.items():
+            days, sketches = self.sketches[table]
+            target = getattr(agg, attr)
+            for sk in sketches[bisect_left(days, start):bisect_left(days, end)]:
+                target.merge(sk)
+        for table, (count_field, sum_field) in _LEARNER_FIELDS.items():
+            shift = self.shifts[table]
+            for lid, n, total, floats in self.learners[table].range(start, end):
+                st = agg.stats(lid)
+                setattr(st, count_field, getattr(st, count_field) + n)
+                setattr(st, sum_field, getattr(st, sum_field) + (total if table == "attendance" else ExactSum(total, shift, floats > 0)))
+
+
+class TimeIndex:
+    """Lazily built ``CohortTimeline`` per cohort of an ``OpsStore``."""
+
+    def __init__(self, store: Any):
+        self.store = store
+        self._cohorts: Dict[str, CohortTimeline] = {}
+
+    def cohort(self, cohort_id: str) -> CohortTimeline:
+        tl = self._cohorts.get(cohort_id)
+        if tl is None:
+            rows = {table: self.store.by_cohort[table].get(cohort_id, ()) for table in _FIELDS}
+            tl = self._cohorts[cohort_id] = CohortTimeline(rows)
+        return tl
+
+    def aggregate(self, cohort_ids: Iterable[str], start: date, end: date) -> Aggregate:
+        """Aggregate over events dated in [start, end); the roster is the cohorts' full learner list."""
+        cohort_ids = list(cohort_ids)
+        agg = Aggregate(cohort_ids)
+        for l in self.store.learners(cohort_ids):
+            agg.add_learner(l)
+        lo, hi = start.toordinal(), end.toordinal()
+        for cid in cohort_ids:
+            self.cohort(cid).add_to(agg, lo, hi)
+        return agg.recount()
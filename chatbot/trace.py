@@ -0,0 +1,169 @@
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        return None
+
+
+_NULL = _NullSpan()
+# None means tracing is off; span() then hands back the shared no-op above.
+_tracer: Optional["Tracer"] = None
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "args", "start", "mem_start", "peak")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+
+    def __enter__(self) -> "_Span":
+        t = self.tracer
+        if t.memory:
+            cur, peak = tracemalloc.get_traced_memory()
+            if t.stack:
+                parent = t.stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.mem_start = cur
+            self.peak = cur
+        t.stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        end = time.perf_counter()
+        t = self.tracer
+        t.stack.pop()
+        depth = len(t.stack)
+        event: Dict[str, Any] = {"name": self.name, "start": self.start, "dur": end - self.start, "depth": depth, "args": self.args}
+        if t.memory:
+            cur, peak = tracemalloc.get_traced_memory()
+            self.peak = max(self.peak, peak)
+            event["alloc"] = cur - self.mem_start
+            event["peak"] = self.peak - self.mem_start
+            if t.stack:
+                parent = t.stack[-1]
+                parent.peak = max(parent.peak, self.peak)
+        t.events.append(event)
+
+
+class Tracer:
+    """Collects nested wall-time spans, plus tracemalloc allocation deltas when ``memory`` is set.
+
+    ``alloc`` is the net change in traced memory over a span and ``peak`` the
+    highest point above its starting level, children included.
+    """
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.events: List[Dict[str, Any]] = []
+        self.stack: List[_Span] = []
+        self.origin = time.perf_counter()
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+    def summary(self) -> "OrderedDict[str, Dict[str, Any]]":
+        # Per span name, in order of first start, so parents precede their children.
+        out: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for e in sorted(self.events, key=lambda e: e["start"]):
+            s = out.get(e["name"])
+            if s is None:
+                s = out[e["name"]] = {"calls": 0, "seconds": 0.0, "depth": e["depth"], "alloc": 0, "peak": 0}
+            s["calls"] += 1
+            s["seconds"] += e["dur"]
+            s["depth"] = min(s["depth"], e["depth"])
+            if self.memory:
+                s["alloc"] += e["alloc"]
+                s["peak"] = max(s["peak"], e["peak"])
+        return out
+
+    def report(self, stream: Optional[TextIO] = None) -> None:
+        stream = stream or sys.stderr
+        header = f"{'phase':<36}{'calls':>7}{'ms':>11}"
+        if self.memory:
+            header += f"{'alloc KiB':>12}{'peak KiB':>12}"
+        print(header, file=stream)
+        for name, s in self.summary().items():
+            line = f"{'  ' * s['depth'] + name:<36}{s['calls']:>7}{s['seconds'] * 1000:>11.2f}"
+            if self.memory:
+                line += f"{s['alloc'] / 1024:>12.1f}{s['peak'] / 1024:>12.1f}"
+            print(line, file=stream)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        events = []
+        for e in self.events:
+            args = dict(e["args"])
+            if self.memory:
+                args.update(alloc_bytes=e["alloc"], peak_bytes=e["peak"])
+            events.append({
+                "name": e["name"],
+                "cat": e["name"].split(".", 1)[0],
+                "ph": "X",
+                "ts": (e["start"] - self.origin) * 1e6,
+                "dur": e["dur"] * 1e6,
+                "pid": self.pid,
+                "tid": self.tid,
+                "args": args,
+            })
+        events.sort(key=lambda ev: ev["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Write a Chrome trace-event JSON file (open in chrome://tracing or Perfetto)."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f, ensure_ascii=False)
+
+
+def enable(memory: bool = False) -> Tracer:
+    global _tracer
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _tracer = Tracer(memory=memory)
+    return _tracer
+
+
+def disable() -> Optional[Tracer]:
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None and tracer.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    return tracer
+
+
+def active() -> Optional[Tracer]:
+    return _tracer
+
+
+def span(name: str, **args: Any) -> Any:
+    """Context manager timing one phase; a shared no-op when tracing is off."""
+    if _tracer is None:
+        return _NULL
+    return _Span(_tracer, name, args)
+
+
+def traced(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(fn)
+        def wrapper(*a: Any, **kw: Any) -> Any:
+            if _tracer is None:
+                return fn(*a, **kw)
+            with _Span(_tracer, name, {}):
+                return fn(*a, **kw)
+        return wrapper
+    return decorate
@@ -0,0 +1,277 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+from chatbot.aggregate import ExactSum, nps_bucket
+from chatbot.sketch import QuantileSketch
+from chatbot.store import as_store
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("numpy is required for the vectorized engine: pip install numpy")
+
+
+def _py_mean(total: Any, count: int, integral: bool) -> float:
+    # Match statistics.mean / ExactSum.mean: exact int averages stay int.
+    if not count:
+        return 0.0
+    if isinstance(total, ExactSum):
+        return total.mean(count)
+    total = total.item() if hasattr(total, "item") else total
+    if integral:
+        total = int(total)
+        if total % count == 0:
+            return total // count
+    return total / count
+
+
+# Float significands are split into two halves of at most this many bits, so grouped float
+# (bincount) sums of the halves stay exact integers below 2**53 for up to 2**26 rows per group.
+_HALF_BITS = 26
+
+
+class _ExactSums:
+    """Exact per-group sums of a float column, computed with NumPy reductions.
+
+    Each value is ``significand * 2**exponent`` with a 53-bit integer
+    significand. Rows are grouped by exponent, and the two halves of the
+    significand are summed per group with ``np.bincount``; those sums are
+    exact, so a group's total is rebuilt without rounding as an
+    ``ExactSum`` on demand. ``floats`` marks rows that were floats in the
+    source (ints in a mixed column), so all-int groups keep int means.
+    """
+
+    def __init__(self, groups: "np.ndarray", values: "np.ndarray", floats: "np.ndarray", n: int):
+        mant, exp = np.frexp(values)
+        sig = np.ldexp(mant, 53).astype(np.int64)
+        exp = exp.astype(np.int64) - 53
+        self.shift = max(0, int(-exp.min())) if len(exp) else 0
+        self.floats = np.bincount(groups, weights=floats, minlength=n) > 0
+        self.parts: List[Tuple[int, "np.ndarray", "np.ndarray"]] = []
+        for e in np.unique(exp[sig != 0]).tolist():
+            sel = (exp == e) & (sig != 0)
+            g, part = groups[sel], sig[sel]
+            hi = np.bincount(g, weights=part >> _HALF_BITS, minlength=n)
+            lo = np.bincount(g, weights=part & ((1 << _HALF_BITS) - 1), minlength=n)
+            self.parts.append((e + self.shift, hi, lo))
+
+    def total(self, i: int) -> ExactSum:
+        num = 0
+        for k, hi, lo in self.parts:
+            if hi[i] or lo[i]:
+                num += ((int(hi[i]) << _HALF_BITS) + int(lo[i])) << k
+        return ExactSum(num, self.shift, bool(self.floats[i]))
+
+
+def _percentiles(values: "np.ndarray") -> Dict[str, Any]:
+    # Fed as (value, count) pairs; identical to core while the values have at most k distinct entries.
+    sketch = QuantileSketch()
+    uniq, counts = np.unique(values, return_counts=True)
+    for v, n in zip(uniq.tolist(), counts.tolist()):
+        sketch.add(v, n)
+    return sketch.percentiles()
+
+
+class _Table:
+    """Event columns sorted by cohort code, with per-cohort offsets for slicing."""
+
+    def __init__(self, cohort: "np.ndarray", learner: "np.ndarray", columns: Dict[str, "np.ndarray"], n_cohorts: int):
+        order = np.argsort(cohort, kind="stable")
+        self.cohort = cohort[order]
+        self.learner = learner[order]
+        self.columns = {k: v[order] for k, v in columns.items()}
+        self.offsets = np.searchsorted(self.cohort, np.arange(n_cohorts + 1))
+
+    def select(self, cohort_codes: List[int]) -> Tuple["np.ndarray", Dict[str, "np.ndarray"]]:
+        if len(cohort_codes) == 1:
+            lo, hi = self.offsets[cohort_codes[0]], self.offsets[cohort_codes[0] + 1]
+            return self.learner[lo:hi], {k: v[lo:hi] for k, v in self.columns.items()}
+        idx = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in sorted(cohort_codes)] or [np.empty(0, dtype=np.int64)])
+        return self.learner[idx], {k: v[idx] for k, v in self.columns.items()}
+
+
+class ArrayEngine:
+    """NumPy engine for compute_kpis/risk_scores over integer-coded event tables.
+
+    Events are held as column arrays sorted by cohort, so a query slices its
+    cohorts and runs grouped reductions (``np.bincount``) per learner. Results
+    match ``chatbot.core`` value for value.
+    """
+
+    def __init__(self, data: Any):
+        _require_numpy()
+        store = as_store(data)
+        self.store = store
+        self.cohort_ids: List[str] = list(store.cohorts_by_id)
+        self.cohort_code: Dict[str, int] = {cid: i for i, cid in enumerate(self.cohort_ids)}
+        self.learner_ids: List[str] = []
+        self.learner_code: Dict[str, int] = {}
+        self.roster: Dict[int, "np.ndarray"] = {}
+        for cid in self.cohort_ids:
+            self.roster[self.cohort_code[cid]] = np.array([self._code_learner(l["id"]) for l in store.learners_by_cohort.get(cid, [])], dtype=np.int64)
+
+        att = store.data.get("attendance", [])
+        self.attendance = self._table(att, present=np.array([a.get("status") == "present" for a in att], dtype=np.int64))
+
+        assess = store.data.get("assessments", [])
+        scores = np.array([a["score"] for a in assess])
+        self.scores_integral = scores.dtype.kind in "iub" or not len(assess)
+        self.assessments = self._table(
+            assess,
+            score=scores.astype(np.int64 if self.scores_integral else np.float64),
+            submitted=np.array([bool(a.get("submitted", False)) for a in assess], dtype=np.int64),
+            quiz=np.array([a.get("type") == "quiz" for a in assess], dtype=bool),
+            float=np.array([isinstance(a["score"], float) for a in assess], dtype=bool),
+        )
+
+        sats = store.data.get("satisfaction", [])
+        ratings = np.array([s["rating"] for s in sats])
+        self.ratings_integral = ratings.dtype.kind in "iub" or not len(sats)
+        self.satisfaction = self._table(
+            sats,
+            rating=ratings.astype(np.int64 if self.ratings_integral else np.float64),
+            nps=np.array([nps_bucket(s["rating"]) for s in sats], dtype=np.int64),
+            float=np.array([isinstance(s["rating"], float) for s in sats], dtype=bool),
+        )
+
+    def _code_learner(self, lid: str) -> int:
+        code = self.learner_code.get(lid)
+        if code is None:
+            code = self.learner_code[lid] = len(self.learner_ids)
+            self.learner_ids.append(lid)
+        return code
+
+    def _table(self, rows: List[dict], **columns: "np.ndarray") -> _Table:
+        n = len(self.cohort_ids)
+        # Events of cohorts missing from the cohort table are never selected.
+        cohort = np.array([self.cohort_code.get(str(r["cohort_id"]), n) for r in rows], dtype=np.int64)
+        learner = np.array([self._code_learner(r["learner_id"]) for r in rows], dtype=np.int64)
+        return _Table(cohort, learner, columns, n)
+
+    def _sums(self, learner: "np.ndarray", weights: "np.ndarray", integral: bool) -> "np.ndarray":
+        sums = np.bincount(learner, weights=weights, minlength=len(self.learner_ids))
+        return sums.round().astype(np.int64) if integral else sums
+
+    def _learner_stats(self, codes: List[int]) -> Dict[str, "np.ndarray"]:
+        n = len(self.learner_ids)
+        a_learner, a_cols = self.attendance.select(codes)
+        s_learner, s_cols = self.assessments.select(codes)
+        r_learner, r_cols = self.satisfaction.select(codes)
+        return {
+            "total": np.bincount(a_learner, minlength=n),
+            "present": np.bincount(a_learner, weights=a_cols["present"], minlength=n).astype(np.int64),
+            "score_count": np.bincount(s_learner, minlength=n),
+            "score_sum": self._sums(s_learner, s_cols["score"], self.scores_integral),
+            "rating_count": np.bincount(r_learner, minlength=n),
+            "rating_sum": self._sums(r_learner, r_cols["rating"], self.ratings_integral),
+            "score_exact": None if self.scores_integral else _ExactSums(s_learner, s_cols["score"], s_cols["float"], n),
+            "rating_exact": None if self.ratings_integral else _ExactSums(r_learner, r_cols["rating"], r_cols["float"], n),
+            "_assess": s_cols,
+            "_sats": r_cols,
+            "_att": a_cols,
+        }
+
+    @staticmethod
+    def _ratio(num: "np.ndarray", den: "np.ndarray") -> "np.ndarray":
+        out = np.zeros(len(num), dtype=np.float64)
+        np.divide(num, den, out=out, where=den > 0)
+        return out
+
+    def _metrics(self, stats: Dict[str, "np.ndarray"], roster: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        att = self._ratio(stats["present"][roster], stats["total"][roster])
+        score = self._ratio(stats["score_sum"][roster], stats["score_count"][roster])
+        sat = self._ratio(stats["rating_sum"][roster], stats["rating_count"][roster])
+        return att, score, sat
+
+    def _means(self, stats: Dict[str, Any], name: str, learners: "np.ndarray") -> List[float]:
+        # Per-learner means as Python numbers, identical to core (exact sums, statistics.mean types).
+        counts = stats[f"{name}_count"][learners].tolist()
+        exact = stats[f"{name}_exact"]
+        if exact is None:
+            return [_py_mean(s, c, True) for s, c in zip(stats[f"{name}_sum"][learners].tolist(), counts)]
+        return [_py_mean(exact.total(i), c, False) for i, c in zip(learners.tolist(), counts)]
+
+    def _roster(self, codes: List[int]) -> "np.ndarray":
+        parts = [self.roster[c] for c in codes]
+        roster = np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+        # Duplicate learner rows collapse to one entry, as with the set in core.
+        _, first = np.unique(roster, return_index=True)
+        return roster[np.sort(first)]
+
+    def compute_kpis(self, company_id: Optional[str] = None, cohort_id: Optional[str] = None) -> Dict[str, Any]:
+        selected = self.store.select_cohorts(company_id=company_id, cohort_id=cohort_id)
+        codes = [self.cohort_code[c] for c in selected]
+        stats = self._learner_stats(codes)
+        att_cols, assess_cols, sat_cols = stats["_att"], stats["_assess"], stats["_sats"]
+
+        n_att = len(att_cols["present"])
+        attendance_rate = (int(att_cols["present"].sum()) / n_att) if n_att else 0.0
+
+        n_assess = len(assess_cols["score"])
+        if n_assess:
+            assignment_completion_rate = int(assess_cols["submitted"].sum()) / n_assess
+            quiz = assess_cols["score"][assess_cols["quiz"]]
+            quiz_sum = int(quiz.sum()) if self.scores_integral else _ExactSums(np.zeros(len(quiz), dtype=np.int64), quiz, assess_cols["float"][assess_cols["quiz"]], 1).total(0)
+            quiz_avg = _py_mean(quiz_sum, len(quiz), self.scores_integral)
+        else:
+            assignment_completion_rate = 0.0
+            quiz_avg = 0.0
+            quiz = assess_cols["score"]
+
+        roster = self._roster(codes)
+        if len(roster):
+            att, score, _ = self._metrics(stats, roster)
+            if stats["score_exact"] is not None:
+                # Float bincount sums are off by a few ulps at most; learners that close to the
+                # cut-off are decided on their exact mean.
+                near = np.flatnonzero(np.abs(score - 60) <= 1e-6)
+                score[near] = self._means(stats, "score", roster[near])
+            completion_rate = int(np.count_nonzero((att >= 0.7) & (score >= 60))) / len(roster)
+        else:
+            completion_rate = 0.0
+
+        ratings = sat_cols["rating"]
+        n_sat = len(ratings)
+        if n_sat:
+            rating_sum = int(ratings.sum()) if self.ratings_integral else _ExactSums(np.zeros(n_sat, dtype=np.int64), ratings, sat_cols["float"], 1).total(0)
+            satisfaction_avg = _py_mean(rating_sum, n_sat, self.ratings_integral)
+            buckets = sat_cols["nps"]
+            nps = ((int(np.count_nonzero(buckets > 0)) - int(np.count_nonzero(buckets < 0))) / n_sat) * 100.0
+        else:
+            satisfaction_avg = 0.0
+            nps = 0.0
+
+        return {
+            "attendance_rate": round(attendance_rate, 3),
+            "assignment_completion_rate": round(assignment_completion_rate, 3),
+            "quiz_avg": round(quiz_avg, 1),
+            "completion_rate": round(completion_rate, 3),
+            "satisfaction_avg": round(satisfaction_avg, 2),
+            "nps": round(nps, 1),
+            "quiz_percentiles": _percentiles(quiz),
+            "satisfaction_percentiles": _percentiles(ratings),
+            "cohorts": sorted(selected),
+        }
+
+    def risk_scores(self, cohort_id: str) -> List[Tuple[str, float, Dict[str, Any]]]:
+        code = self.cohort_code.get(str(cohort_id))
+        if code is None:
+            return []
+        stats = self._learner_stats([code])
+        roster = self._roster([code])
+        att, _, _ = self._metrics(stats, roster)
+        # Means are rebuilt in Python so int-valued averages and rounding match core exactly.
+        score = self._means(stats, "score", roster)
+        sat = self._means(stats, "rating", roster)
+        sc = np.array(score, dtype=np.float64)
+        sa = np.array(sat, dtype=np.float64)
+        risk = (1 - att) * 0.5 + (np.maximum(0, (60 - sc)) / 60) * 0.3 + (np.maximum(0, (3.5 - sa)) / 3.5) * 0.2
+        out = []
+        for i, (lid_code, r, ar) in enumerate(zip(roster.tolist(), risk.tolist(), att.tolist())):
+            out.append((self.learner_ids[lid_code], round(r, 3), {"attendance": round(ar, 2), "score": round(score[i], 1), "satisfaction": round(sat[i], 2)}))
+        out.sort(key=lambda x: x[1], reverse=True)
+        return out
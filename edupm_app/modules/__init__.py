@@ -0,0 +1,18 @@
+import os
+import sys
+
+# Repository root: `chatbot` and the default dataset live here.
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def add_repo_root():
+    """Put the repository root on sys.path so `chatbot` imports resolve.
+
+    `streamlit run edupm_app/app.py` only puts edupm_app/ on sys.path. Called
+    once here, so every page module can import `chatbot` directly.
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+
+
+add_repo_root()
@@ -1,5 +1,12 @@
 import streamlit as st
 
+from chatbot.briefs import duration_days
+from modules import data
+
+
+def _index(options, value):
+    return options.index(value) if value in options else 0
+
 
 def run():
     st.subheader("커리큘럼 제안")
@@ -7,14 +14,29 @@ def run():
         st.info("먼저 Discovery에서 브리프를 생성해 주세요.")
         return
     b = st.session_state.brief
-    modules = [
-        f"[Week1] {b['role']} 업무 이해 & 데이터 리터러시",
-        "[Week2] AI 활용 사례 & 프롬프트 엔지니어링",
-        "[Week3] 실습: 사내 데이터로 KPI 정의 & 미니분석",
-        "[Week4] 자동화: 노코드/파이썬으로 리포트 생성",
-        "Capstone: 우리팀 Use-case 설계 & 발표",
-    ]
+    matrix, table = data.curriculum_matrix()
+    cols = st.columns(2)
+    role = cols[0].selectbox("대상 직무", matrix["roles"], index=_index(matrix["roles"], b.get("role")), key="curriculum_role")
+    level = cols[1].selectbox("레벨", matrix["levels"], index=_index(matrix["levels"], b.get("level")), key="curriculum_level")
+    entry = table[(role, level)]
+
+    # Same sizing as chatbot recommend: 2 catalog modules per week, at least 2.
+    days = duration_days(b.get("duration")) or 7
+    picked = entry["modules"][: max(2, days // 7 * 2)]
+    unit = "Week" if days >= 7 else "Day"
+    modules = (
+        [f"[핵심] {s}" for s in entry["samples"]]
+        + [f"[{unit}{i // 2 + 1}] {m['topic']} ({m.get('duration_hours', 2)}h)" for i, m in enumerate(picked)]
+        + ["Capstone: 우리팀 Use-case 설계 & 발표"]
+    )
     st.write("추천 모듈")
     st.markdown("\n".join([f"- {m}" for m in modules]))
+    if picked:
+        st.caption(f"{role} 태그: {', '.join(entry['tags'])}")
+        st.dataframe(
+            [{"모듈": m.get("id"), "주제": m["topic"], "레벨": m.get("level"), "일치 태그": ", ".join(m["matched"]), "점수": m["score"]} for m in picked],
+            hide_index=True,
+            use_container_width=True,
+        )
     st.session_state.outputs["modules"] = modules
     st.success("좌측 메뉴에서 타임라인으로 이동할 수 있습니다.")
@@ -0,0 +1,193 @@
+import json
+import os
+import threading
+import time
+
+import streamlit as st
+
+from chatbot.briefs import BriefIndex, BriefStore
+from chatbot.catalog import get_catalog
+from chatbot.core import DATA_PATH, compute_kpis, load_store, weekly_report
+from chatbot.sqlite_store import is_sqlite_path
+from chatbot.snapshot import load_cached_store
+from chatbot.stream import JsonlTail, StreamingStore
+from modules import ROOT
+
+
+def data_path():
+    # EDUPM_DATA points the app at another seed JSON or SQLite file.
+    return os.environ.get("EDUPM_DATA") or DATA_PATH
+
+
+def data_version(path=None):
+    # One stat() per rerun; any edit to the file yields a new version and so new cache keys.
+    path = path or data_path()
+    try:
+        st_ = os.stat(path)
+    except OSError:
+        return (path, None, None)
+    return (path, st_.st_mtime_ns, st_.st_size)
+
+
+@st.cache_resource(show_spinner="데이터 불러오는 중...", max_entries=2)
+def _load(path, version):
+    # Shared by every session; `version` is part of the key so a changed file is loaded afresh.
+    if is_sqlite_path(path):
+        return load_store(path)
+    return load_cached_store(path)
+
+
+def store():
+    path = data_path()
+    return _load(path, data_version(path))
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cohorts(version):
+    return [{"id": cid, "company_id": str(c.get("company_id")), "name": c.get("name", cid)} for cid, c in _load(version[0], version).cohorts_by_id.items()]
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def kpis(cohort_id, version):
+    return compute_kpis(_load(version[0], version), cohort_id=cohort_id)
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def report(company_id, cohort_id, version):
+    return weekly_report(_load(version[0], version), company_id, cohort_id)
+
+
+def cohort_picker(label="코호트", key=None):
+    """Cohort selectbox; returns (cohort dict, data version) or (None, version) when there is no data."""
+    version = data_version()
+    options = cohorts(version)
+    if not options:
+        st.warning("코호트 데이터가 없습니다.")
+        return None, version
+    picked = st.selectbox(label, options, format_func=lambda c: f"{c['id']} · {c['name']} ({c['company_id']})", key=key)
+    return picked, version
+
+
+# Role x level matrix behind the curriculum stage (sample modules, role tags, catalog level names).
+MATRIX_PATH = os.path.join(ROOT, "edupm_app", "assets", "matrices.json")
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _curriculum_table(matrix_version, version):
+    # Compiled once per (matrix, dataset) version and shared by every session: each (role, level)
+    # cell holds its catalog modules already ranked, so switching role/level is a dict lookup.
+    with open(matrix_version[0], encoding="utf-8") as f:
+        matrix = json.load(f)
+    catalog = get_catalog(_load(version[0], version))
+    table = {}
+    for role in matrix["roles"]:
+        tags = matrix.get("role_tags", {}).get(role, [])
+        wanted = {t.lower() for t in tags}
+        for level in matrix["levels"]:
+            scores = catalog.scores(role, matrix.get("catalog_levels", {}).get(level, level), tags)
+            ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+            table[(role, level)] = {
+                "samples": matrix.get("samples", {}).get(role, {}).get(level, []),
+                "tags": tags,
+                "modules": [dict(catalog.modules[i], score=score, matched=sorted(catalog.tags[i] & wanted)) for i, score in ranked],
+            }
+    return matrix, table
+
+
+def curriculum_matrix():
+    """(matrix dict, {(role, level): {"samples", "tags", "modules"}})."""
+    return _curriculum_table(data_version(MATRIX_PATH), data_version())
+
+
+class LiveFeed:
+    """Incrementally updated counters behind the live ops view, shared by every session.
+
+    Built from the cached ``_load`` store rather than a second load of the
+    file. With ``EDUPM_EVENTS`` set, events appended to that JSON Lines
+    export are folded into a ``StreamingStore`` as they arrive (its rows
+    replace the dataset's own events); otherwise the counters are seeded from
+    the store's per-cohort aggregates, so JSON and SQLite datasets show the
+    same numbers.
+    Each cohort carries a change counter, so a view redraws only when its
+    cohort received events. Polls are rate-limited process-wide, however
+    many sessions refresh.
+    """
+
+    def __init__(self, source, events_path=None, min_interval=1.0):
+        self.source = source
+        self.events_path = events_path
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.tail = JsonlTail(events_path) if events_path else None
+        self.epoch = 0
+        self._reset()
+
+    def _reset(self):
+        self.store = StreamingStore(self.source) if self.tail else StreamingStore.from_store(self.source)
+        self.versions = {}
+        self.epoch += 1
+        self.polled = 0.0
+        self.resets = self.tail.resets if self.tail else 0
+
+    def poll(self):
+        if self.tail is None or time.monotonic() - self.polled < self.min_interval:
+            return
+        with self.lock:
+            if time.monotonic() - self.polled < self.min_interval:
+                return
+            rows = self.tail.read()
+            if self.tail.resets != self.resets:
+                # The export was truncated or rotated: its rows are read again from the top.
+                self._reset()
+            for row in rows:
+                cid = self.store.apply_event(row)
+                if cid is not None:
+                    self.versions[cid] = self.versions.get(cid, 0) + 1
+            self.polled = time.monotonic()
+
+    def version(self, cohort_id):
+        # The epoch keeps versions from before a rebuild from matching ones after it.
+        return self.epoch, self.versions.get(cohort_id, 0)
+
+    def snapshot(self, cohort_id, top=5):
+        with self.lock:
+            agg = self.store.aggregate([cohort_id])
+            return self.version(cohort_id), agg.kpis(), agg.top_risks(top)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _live_feed(path, events_path, version):
+    return LiveFeed(_load(path, version), events_path)
+
+
+def live_feed():
+    # A new data file version starts a fresh feed; the events export itself is only ever tailed.
+    path = data_path()
+    return _live_feed(path, os.environ.get("EDUPM_EVENTS"), data_version(path))
+
+
+# Saved Discovery briefs; EDUPM_BRIEFS points at another SQLite file.
+BRIEFS_PATH = os.path.join(ROOT, "edupm_app", "briefs.db")
+
+
+@st.cache_resource(show_spinner=False)
+def _briefs(path):
+    # One store and one feature index per process; saves update the index in place.
+    briefs = BriefStore(path)
+    return briefs, BriefIndex(briefs.rows()), threading.Lock()
+
+
+def save_brief(brief):
+    briefs, index, lock = _briefs(os.environ.get("EDUPM_BRIEFS") or BRIEFS_PATH)
+    with lock:
+        # Saving an unchanged brief again returns its existing id; only new rows reach the index.
+        brief_id = briefs.add(brief)
+        if brief_id not in index.briefs:
+            index.add(*briefs.row(brief_id))
+    return brief_id
+
+
+def similar_briefs(brief, k=3, exclude=()):
+    _, index, lock = _briefs(os.environ.get("EDUPM_BRIEFS") or BRIEFS_PATH)
+    with lock:
+        return index.similar(brief, k, exclude)
@@ -1,5 +1,44 @@
+import os
+
 import streamlit as st
 
+from modules import data
+
+# Seconds between live refreshes of the cohort panel (fragment reruns, not full-page reruns).
+REFRESH_SECONDS = float(os.environ.get("EDUPM_REFRESH_SECONDS", "5"))
+
+
+def _live_panel(cohort_id):
+    feed = data.live_feed()
+    feed.poll()
+    cached = st.session_state.get("ops_live")
+    version = feed.version(cohort_id)
+    if cached is None or cached["cohort"] != cohort_id or cached["version"] != version:
+        # Recompute only when this cohort received events since the last tick.
+        _, k, rows = feed.snapshot(cohort_id)
+        prev = cached["kpis"] if cached is not None and cached["cohort"] == cohort_id else None
+        cached = st.session_state["ops_live"] = {"cohort": cohort_id, "version": version, "kpis": k, "prev": prev, "risks": rows}
+    k, prev, rows = cached["kpis"], cached["prev"], cached["risks"]
+
+    def delta(key, scale=1, fmt="+.1f", unit=""):
+        if prev is None or k[key] == prev[key]:
+            return None
+        return f"{(k[key] - prev[key]) * scale:{fmt}}{unit}"
+
+    cols = st.columns(6)
+    cols[0].metric("출석률", f"{k['attendance_rate'] * 100:.0f}%", delta("attendance_rate", 100, "+.0f", "%p"))
+    cols[1].metric("과제 제출률", f"{k['assignment_completion_rate'] * 100:.0f}%", delta("assignment_completion_rate", 100, "+.0f", "%p"))
+    cols[2].metric("퀴즈 평균", k["quiz_avg"], delta("quiz_avg"))
+    cols[3].metric("수료(추정)", f"{k['completion_rate'] * 100:.0f}%", delta("completion_rate", 100, "+.0f", "%p"))
+    cols[4].metric("만족도", k["satisfaction_avg"], delta("satisfaction_avg", fmt="+.2f"))
+    cols[5].metric("NPS", f"{k['nps']:.1f}", delta("nps"))
+    st.write("위험 학습자 Top 5")
+    if rows:
+        st.dataframe([dict({"학습자": lid, "위험도": r}, **detail) for lid, r, detail in rows], hide_index=True, use_container_width=True)
+    else:
+        st.caption("학습자 데이터가 없습니다.")
+    st.caption(f"이벤트 {feed.store.events:,}건 반영 · {REFRESH_SECONDS:g}초마다 갱신" if feed.tail else f"이벤트 {feed.store.events:,}건 반영")
+
 
 def run():
     st.subheader("운영 체크리스트 & 리스크")
@@ -11,4 +50,13 @@ def run():
 **리스크**: 출석률<70% → 리마인드/보상 / 난이도 미스매치 → 실습 대체안
 """
     )
+
+    st.markdown("#### 코호트 현황")
+    cohort, version = data.cohort_picker(key="ops_cohort")
+    if cohort is not None:
+        live = st.toggle("실시간 갱신", value=bool(os.environ.get("EDUPM_EVENTS")), key="ops_live_on")
+        # Only this panel reruns on the timer; the checklist and picker above are left alone.
+        st.fragment(run_every=REFRESH_SECONDS if live else None)(_live_panel)(cohort["id"])
+        with st.expander("주간 리포트"):
+            st.text(data.report(cohort["company_id"], cohort["id"], version))
     st.success("좌측 메뉴에서 문서 자동화로 이동하세요.")
@@ -1,26 +1,32 @@
 import streamlit as st
 
+from modules import data
+from modules.retro_bulk import row_actions, run_bulk
+
+
+def _clamp(x, lo, hi):
+    return max(lo, min(hi, x))
+
 
 def run():
     st.subheader("사후 회고 입력")
-    attend = st.slider("수강률(%)", 40, 100, 87)
-    assign = st.slider("과제제출률(%)", 40, 100, 92)
-    sat = st.slider("만족도(5점)", 1.0, 5.0, 4.6, 0.1)
-    nps = st.slider("NPS", -100, 100, 42)
+    if st.radio("방식", ["단일 코호트", "일괄 업로드"], horizontal=True, key="retro_mode") == "일괄 업로드":
+        run_bulk()
+        return
+    cohort, version = data.cohort_picker("회고할 코호트", key="retro_cohort")
+    # Sliders start from the cohort's measured KPIs; keys include the cohort so switching cohorts resets them.
+    k = data.kpis(cohort["id"], version) if cohort is not None else {}
+    suffix = cohort["id"] if cohort is not None else "manual"
+    attend = st.slider("수강률(%)", 40, 100, _clamp(round(k.get("attendance_rate", 0.87) * 100), 40, 100), key=f"attend_{suffix}")
+    assign = st.slider("과제제출률(%)", 40, 100, _clamp(round(k.get("assignment_completion_rate", 0.92) * 100), 40, 100), key=f"assign_{suffix}")
+    sat = st.slider("만족도(5점)", 1.0, 5.0, _clamp(round(float(k.get("satisfaction_avg", 4.6)), 1), 1.0, 5.0), 0.1, key=f"sat_{suffix}")
+    nps = st.slider("NPS", -100, 100, _clamp(round(k.get("nps", 42)), -100, 100), key=f"nps_{suffix}")
     feedback = st.text_area("핵심 피드백", "2주차 난이도 다소 높음, 실습시간 확장 희망")
 
     if st.button("개선안 제시"):
-        actions = []
-        if attend < 80:
-            actions.append("다음 기수: 리마인드 시점 확대, 보강 세션 도입")
-        if assign < 80:
-            actions.append("과제 가이드 명확화, 마감 48/12시간 전 알림")
-        if sat < 4.0:
-            actions.append("체크인 질문 추가, 인터랙션 강화")
-        if nps < 0:
-            actions.append("성과 공유 주기 상향, 이해관계자 커뮤니케이션 강화")
-        if "난이도" in feedback:
-            actions.append("2주차 실습 쉬운 예제 추가, 사전가이드 배포, 실습시간 +20분")
+        actions, themes = row_actions({"attend": attend, "assign": assign, "sat": sat, "nps": nps}, feedback)
+        if themes:
+            st.caption("피드백 테마: " + ", ".join(themes))
         st.success("다음 기수 액션")
-        for a in actions or ["현재 운영 유지, 베스트 프랙티스 문서화"]:
+        for a in actions:
             st.write(f"- {a}")
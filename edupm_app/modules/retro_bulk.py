@@ -0,0 +1,145 @@
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from chatbot.themes import default_matcher
+
+# (column, threshold, action): the action applies when the cohort's value is below the threshold.
+RULES = [
+    ("attend", 80, "다음 기수: 리마인드 시점 확대, 보강 세션 도입"),
+    ("assign", 80, "과제 가이드 명확화, 마감 48/12시간 전 알림"),
+    ("sat", 4.0, "체크인 질문 추가, 인터랙션 강화"),
+    ("nps", 0, "성과 공유 주기 상향, 이해관계자 커뮤니케이션 강화"),
+]
+# Feedback theme (chatbot.themes.THEMES) -> action. Themes whose keywords are as often praise
+# as complaint (강사, 과제, 만족 ...) are counted but trigger no action.
+THEME_ACTIONS = {
+    "난이도": "2주차 실습 쉬운 예제 추가, 사전가이드 배포, 실습시간 +20분",
+    "시간": "세션 시간 재배분, 실습 시간 확보",
+    "환경": "사전 접속/설치 점검 세션 추가",
+}
+DEFAULT_ACTION = "현재 운영 유지, 베스트 프랙티스 문서화"
+# Accepted upload headers per column (chatbot KPI names included, so `kpi` exports load as-is).
+COLUMNS = {
+    "cohort": ("cohort", "cohort_id", "코호트"),
+    "attend": ("attend", "attendance", "attendance_rate", "수강률"),
+    "assign": ("assign", "assignment", "assignment_completion_rate", "과제제출률"),
+    "sat": ("sat", "satisfaction", "satisfaction_avg", "만족도"),
+    "nps": ("nps",),
+    "feedback": ("feedback", "text", "comment", "피드백"),
+}
+CHUNK_ROWS = 2000
+
+
+def row_actions(values, feedback):
+    """Actions and themes for one cohort, by the same rules as the bulk table."""
+    actions = [a for col, thr, a in RULES if values[col] < thr]
+    themes = default_matcher().themes_in(feedback)
+    actions += [THEME_ACTIONS[t] for t in themes if t in THEME_ACTIONS]
+    return actions or [DEFAULT_ACTION], themes
+
+
+def _normalize(chunk, scale):
+    lookup = {str(c).strip().lower(): c for c in chunk.columns}
+    out = pd.DataFrame(index=chunk.index)
+    for col, names in COLUMNS.items():
+        src = next((lookup[n] for n in names if n in lookup), None)
+        if col in ("cohort", "feedback"):
+            out[col] = chunk[src].fillna("").astype(str) if src is not None else ""
+        else:
+            out[col] = pd.to_numeric(chunk[src], errors="coerce") if src is not None else np.nan
+    for col in ("attend", "assign"):
+        if scale.get(col):
+            out[col] = out[col] * 100
+    return out
+
+
+def evaluate(chunk, scale=None):
+    """Rule and theme actions for every row of an upload chunk.
+
+    Thresholds run as column comparisons; each row's hits are packed into a
+    bitmask, so the action text is built once per distinct combination
+    rather than once per cohort. Feedback goes through one precompiled
+    Aho–Corasick pass per row. Returns (table, theme flag matrix).
+    """
+    df = _normalize(chunk, scale or {})
+    matcher = default_matcher()
+    themes = matcher.themes
+    theme_flags = np.zeros((len(df), len(themes)), dtype=bool)
+    for row, text in enumerate(df["feedback"].tolist()):
+        for t in matcher.theme_ids(text):
+            theme_flags[row, t] = True
+
+    actionable = [i for i, t in enumerate(themes) if t in THEME_ACTIONS]
+    texts = [a for _, _, a in RULES] + [THEME_ACTIONS[themes[i]] for i in actionable]
+    # NaN compares False, so a missing metric triggers nothing.
+    flags = np.column_stack([(df[col] < thr).to_numpy() for col, thr, _ in RULES] + [theme_flags[:, i] for i in actionable])
+    codes = flags.astype(np.int64) @ (np.int64(1) << np.arange(flags.shape[1], dtype=np.int64))
+    labels = {c: " / ".join(a for bit, a in enumerate(texts) if c >> bit & 1) or DEFAULT_ACTION for c in np.unique(codes).tolist()}
+
+    df["themes"] = [", ".join(themes[i] for i in np.flatnonzero(r)) for r in theme_flags]
+    df["actions"] = pd.Series(codes, index=df.index).map(labels)
+    return df, theme_flags
+
+
+def _chunks(raw, name):
+    buf = io.BytesIO(raw)
+    name = name.lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return pd.read_json(buf, lines=True, chunksize=CHUNK_ROWS)
+    if name.endswith(".json"):
+        # A JSON array cannot be read incrementally: parse it whole, then hand it out in the same chunks.
+        df = pd.read_json(buf)
+        return (df.iloc[i : i + CHUNK_ROWS] for i in range(0, len(df), CHUNK_ROWS))
+    return pd.read_csv(buf, chunksize=CHUNK_ROWS, encoding="utf-8-sig")
+
+
+def _scan(raw, name):
+    # 0-1 rates (chatbot KPI exports) vs percentages is decided per column over the whole file, not per row.
+    peaks, rows = {}, 0
+    for chunk in _chunks(raw, name):
+        df = _normalize(chunk, {})
+        rows += len(df)
+        for col in ("attend", "assign"):
+            peaks[col] = max(peaks.get(col, 0), df[col].max(skipna=True) if df[col].notna().any() else 0)
+    return {col: bool(0 < peak <= 1) for col, peak in peaks.items()}, rows
+
+
+def run_bulk():
+    upload = st.file_uploader("코호트 지표/피드백 파일 (CSV, JSON 배열 또는 JSONL)", type=["csv", "jsonl", "ndjson", "json"])
+    st.caption("열: cohort, attend(%), assign(%), sat(5점), nps, feedback — attendance_rate 등 chatbot KPI 이름도 인식")
+    if upload is None:
+        return
+    raw = upload.getvalue()
+    key = hashlib.sha1(raw).hexdigest()
+    result = st.session_state.get("retro_bulk")
+    if result is None or result["key"] != key:
+        # Rows are evaluated chunk by chunk and shown as they finish; reruns reuse the stored result.
+        scale, total = _scan(raw, upload.name)
+        parts, counts = [], np.zeros(len(default_matcher().themes), dtype=np.int64)
+        progress = st.progress(0.0, text="분석 중...")
+        preview = st.empty()
+        for chunk in _chunks(raw, upload.name):
+            table, flags = evaluate(chunk, scale)
+            parts.append(table)
+            counts += flags.sum(axis=0)
+            done = sum(len(p) for p in parts)
+            progress.progress(min(1.0, done / max(total, 1)), text=f"{done:,} / {total:,}개 코호트 분석")
+            preview.dataframe(table.tail(20), hide_index=True, use_container_width=True)
+        progress.empty()
+        preview.empty()
+        table = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=list(COLUMNS) + ["themes", "actions"])
+        result = st.session_state["retro_bulk"] = {"key": key, "table": table, "counts": counts.tolist()}
+
+    table = result["table"]
+    st.success(f"{len(table):,}개 코호트 분석 완료")
+    st.dataframe(table, hide_index=True, use_container_width=True)
+    st.download_button("결과 CSV 다운로드", table.to_csv(index=False).encode("utf-8-sig"), file_name="retro_actions.csv", mime="text/csv")
+    themes = default_matcher().themes
+    counts = pd.DataFrame({"테마": themes, "코호트 수": result["counts"]}).sort_values("코호트 수", ascending=False)
+    st.write("테마별 언급 코호트 수")
+    st.bar_chart(counts.set_index("테마"))
+    st.dataframe(counts, hide_index=True)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Tests import `chatbot` from the repository root, however pytest is invoked.
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
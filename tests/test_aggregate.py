@@ -0,0 +1,47 @@
+import random
+from statistics import mean
+
+import pytest
+
+from chatbot.aggregate import ExactSum
+
+
+def _values(rnd, n):
+    pool = [0.1, 0.2, 0.3, 37.5, 4.2, 1e-300, 1e300, -1e300, 2.5]
+    return [rnd.choice([rnd.randint(-100, 100), round(rnd.uniform(0, 100), rnd.randint(0, 3)), rnd.choice(pool)]) for _ in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_mean_matches_statistics_mean(seed):
+    rnd = random.Random(seed)
+    values = _values(rnd, rnd.randint(1, 40))
+    total = ExactSum()
+    for v in values:
+        total.add(v)
+    got, want = total.mean(len(values)), mean(values)
+    assert got == want and type(got) is type(want)
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_split_merge_and_subtract_keep_the_exact_sum(seed):
+    rnd = random.Random(seed)
+    values = _values(rnd, rnd.randint(2, 40))
+    cut = rnd.randint(1, len(values) - 1)
+    head, tail = ExactSum(), ExactSum()
+    for v in values[:cut]:
+        head.add(v)
+    for v in reversed(values[cut:]):
+        tail.add(v)
+    whole = head + tail
+    assert whole.mean(len(values)) == mean(values)
+    assert (whole - head).mean(len(values) - cut) == mean(values[cut:])
+
+
+def test_int_means_stay_int():
+    total = ExactSum()
+    for v in (1, 2, 3):
+        total.add(v)
+    assert total.mean(3) == 2 and type(total.mean(3)) is int
+    total.add(2, times=2)
+    assert total.mean(5) == mean([1, 2, 3, 2, 2])
+    assert ExactSum().mean(0) == 0.0
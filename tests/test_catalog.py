@@ -0,0 +1,144 @@
+import itertools
+import math
+import random
+
+import pytest
+
+from chatbot.catalog import UNITS_PER_HOUR, ModuleCatalog
+
+
+def _units(m):
+    return max(1, math.ceil(m.get("duration_hours", 2) * UNITS_PER_HOUR - 1e-9))
+
+
+def _check_feasible(catalog, plan, weeks, hours_budget, week_hours, respect_prereqs=True):
+    ids = {m["id"] for m in catalog.modules}
+    week_of = {}
+    for w, week in enumerate(plan["schedule"]):
+        for mid in week["modules"]:
+            assert mid not in week_of, f"{mid} planned twice"
+            week_of[mid] = w
+        if week_hours is not None:
+            assert week["hours"] <= week_hours + 1e-9
+    assert len(plan["schedule"]) == max(1, weeks)
+    if hours_budget is not None:
+        assert plan["total_hours"] <= hours_budget + 1e-9
+    if respect_prereqs:
+        for m in plan["modules"]:
+            for p in m.get("prereqs", []):
+                if p in ids:
+                    assert p in week_of and week_of[p] <= week_of[m["id"]], f"{m['id']} before its prerequisite {p}"
+
+
+def _best_closed_set(catalog, scores, capacity, week_cap):
+    """Best score over prerequisite-closed module sets within the total-hours capacity (weeks ignored)."""
+    ids = {m["id"]: i for i, m in enumerate(catalog.modules)}
+    best = 0
+    n = len(catalog.modules)
+    for r in range(n + 1):
+        for combo in itertools.combinations(range(n), r):
+            chosen = set(combo)
+            if any(_units(catalog.modules[i]) > week_cap for i in chosen):
+                continue
+            if sum(_units(catalog.modules[i]) for i in chosen) > capacity:
+                continue
+            if any(ids[p] not in chosen for i in chosen for p in catalog.modules[i].get("prereqs", []) if p in ids):
+                continue
+            best = max(best, sum(scores.get(i, 0) for i in chosen))
+    return best
+
+
+def test_zero_score_prerequisite_is_planned():
+    # P scores 0 but X needs it: P + X (3h, score 4) beats Y (3h, score 2).
+    catalog = ModuleCatalog(
+        [
+            {"id": "P", "level": "senior", "duration_hours": 1, "tags": []},
+            {"id": "X", "level": "junior", "duration_hours": 2, "tags": ["sql", "data"], "prereqs": ["P"]},
+            {"id": "Y", "level": "junior", "duration_hours": 3, "tags": []},
+        ]
+    )
+    plan = catalog.plan("dev", "junior", 4, ["sql", "data"], hours_budget=3)
+    assert [m["id"] for m in plan["modules"]] == ["P", "X"]
+    assert plan["score"] == 4
+    assert plan["optimal"] is True
+
+
+def test_cycles_and_oversized_prerequisites_are_excluded():
+    catalog = ModuleCatalog(
+        [
+            {"id": "A", "level": "junior", "duration_hours": 1, "prereqs": ["B"]},
+            {"id": "B", "level": "junior", "duration_hours": 1, "prereqs": ["A"]},
+            {"id": "BIG", "level": "mid", "duration_hours": 10},
+            {"id": "C", "level": "junior", "duration_hours": 1, "prereqs": ["BIG"]},
+            {"id": "D", "level": "junior", "duration_hours": 1, "prereqs": ["unknown"]},
+        ]
+    )
+    plan = catalog.plan("dev", "junior", 2, hours_budget=10, week_hours=4)
+    assert [m["id"] for m in plan["modules"]] == ["D"]
+    assert plan["optimal"] is True
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_plan_is_feasible_and_optimal_when_it_says_so(seed):
+    rnd = random.Random(seed)
+    n = rnd.randint(3, 9)
+    modules = []
+    for i in range(n):
+        prereqs = rnd.sample([f"M{j}" for j in range(i)], rnd.randint(0, min(i, 2))) if i and rnd.random() < 0.5 else []
+        modules.append(
+            {
+                "id": f"M{i}",
+                "level": rnd.choice(["junior", "mid"]),
+                "duration_hours": rnd.choice([0.5, 1, 1.5, 2, 3, 4]),
+                "tags": rnd.sample(["sql", "data", "viz", "pm"], rnd.randint(0, 2)),
+                "prereqs": prereqs,
+            }
+        )
+    catalog = ModuleCatalog(modules)
+    weeks = rnd.randint(1, 3)
+    hours_budget = rnd.choice([None, 3, 5, 8])
+    week_hours = rnd.choice([None, 2, 3, 4]) if hours_budget is not None else rnd.choice([2, 3, 4])
+    for respect_prereqs in (True, False):
+        plan = catalog.plan("pm", "junior", weeks, ["sql", "viz"], hours_budget=hours_budget, week_hours=week_hours, respect_prereqs=respect_prereqs)
+        _check_feasible(catalog, plan, weeks, hours_budget, week_hours, respect_prereqs)
+        if respect_prereqs:
+            total_cap = min(x for x in (hours_budget, None if week_hours is None else week_hours * max(1, weeks)) if x is not None)
+            capacity = math.floor(total_cap * UNITS_PER_HOUR + 1e-9)
+            week_cap = capacity if week_hours is None else math.floor(week_hours * UNITS_PER_HOUR + 1e-9)
+            best = _best_closed_set(catalog, catalog.scores("pm", "junior", ["sql", "viz"]), capacity, week_cap)
+            assert plan["score"] <= best
+            if plan["optimal"]:
+                assert plan["score"] == best
+
+
+def test_plan_without_limits_is_rejected():
+    with pytest.raises(ValueError):
+        ModuleCatalog([]).plan("pm", "junior", 4)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_plan_is_feasible_on_large_catalogs(seed):
+    # Too big to brute-force: only the schedule's constraints are checked.
+    rnd = random.Random(seed)
+    modules = []
+    for i in range(400):
+        prereqs = [f"M{j}" for j in rnd.sample(range(i), min(i, rnd.choice([0, 0, 1, 2, 3])))]
+        if rnd.random() < 0.02:
+            prereqs.append(f"M{rnd.randrange(i, 400)}")  # forward references can close cycles
+        modules.append(
+            {
+                "id": f"M{i}",
+                "level": rnd.choice(["junior", "mid", "senior"]),
+                "duration_hours": rnd.choice([0.5, 1, 2, 3, 4, 6]),
+                "tags": rnd.sample(["sql", "data", "viz", "pm", "python", "ml"], rnd.randint(0, 3)),
+                "prereqs": prereqs,
+            }
+        )
+    catalog = ModuleCatalog(modules)
+    weeks = rnd.randint(1, 12)
+    hours_budget = rnd.choice([None, 10, 40, 120])
+    week_hours = rnd.choice([None, 4, 8]) if hours_budget is not None else rnd.choice([4, 8])
+    for respect_prereqs in (True, False):
+        plan = catalog.plan("pm", "mid", weeks, ["sql", "ml"], hours_budget=hours_budget, week_hours=week_hours, respect_prereqs=respect_prereqs)
+        _check_feasible(catalog, plan, weeks, hours_budget, week_hours, respect_prereqs)
+        assert plan["score"] == sum(catalog.scores("pm", "mid", ["sql", "ml"]).get(i, 0) for i, m in enumerate(catalog.modules) if m in plan["modules"])
@@ -0,0 +1,61 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import reference
+from chatbot.sqlite_store import SqliteStore, import_json
+from chatbot.store import EVENT_TABLES, OpsStore
+from chatbot.stream import StreamingStore
+from chatbot.synth import generate
+from chatbot.timeline import event_date
+
+
+def _dataset(seed):
+    data = generate(companies=2, cohorts_per_company=3, learners_per_cohort=7, events_per_learner=13, modules=5, seed=seed)
+    rnd = random.Random(seed)
+    # Undated rows and dates scattered over four months, so ranges start and end mid-cohort.
+    for table in EVENT_TABLES:
+        for row in data[table]:
+            x = rnd.random()
+            if x < 0.1:
+                row.pop("date", None)
+            elif x < 0.5:
+                row["date"] = (date(2025, 1, 1) + timedelta(days=rnd.randint(0, 120))).isoformat()
+    return data
+
+
+def _in_range(data, cohort_ids, start, end):
+    """The dataset cut down to dated events of ``cohort_ids`` in [start, end), by a plain scan."""
+    rows = {t: [r for r in data[t] if str(r["cohort_id"]) in cohort_ids and event_date(r) and start <= event_date(r) < end] for t in EVENT_TABLES}
+    cohorts = [c for c in data["cohorts"] if c["id"] in cohort_ids]
+    return dict(data, cohorts=cohorts, **rows)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_range_queries_match_a_plain_scan(seed, tmp_path):
+    data = _dataset(seed)
+    events = [(t, r) for t in EVENT_TABLES for r in data[t]]
+    random.Random(seed).shuffle(events)
+    stream = StreamingStore(data)
+    for table, row in events:
+        stream.apply_event(row, table)
+    path = str(tmp_path / "timeline.db")
+    import_json(data, path)
+    stores = {"json": OpsStore(data), "stream": stream, "sqlite": SqliteStore(path)}
+
+    rnd = random.Random(seed)
+    cids = [c["id"] for c in data["cohorts"]]
+    for _ in range(40):
+        selected = sorted(rnd.sample(cids, rnd.randint(1, 3)), key=cids.index)
+        start = date(2025, 1, 1) + timedelta(days=rnd.randint(0, 100))
+        end = start + timedelta(days=rnd.randint(0, 40))
+        sub = _in_range(data, set(selected), start, end)
+        want = reference.compute_kpis(sub)
+        want_risks = {cid: sorted(reference.risk_scores(sub, cid)) for cid in selected}
+        for name, store in stores.items():
+            got = store.aggregate_range(selected, start, end).kpis()
+            assert {k: got[k] for k in want} == want, (name, selected, start, end)
+            for cid in selected:
+                got_risks = sorted(store.aggregate_range([cid], start, end).risks())
+                assert got_risks == want_risks[cid], (name, cid, start, end)
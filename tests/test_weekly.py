@@ -0,0 +1,101 @@
+import pytest
+
+from chatbot.core import compute_kpis_range, compute_kpis_week, weekly_report
+from chatbot.sqlite_store import SqliteStore, import_json
+from chatbot.store import OpsStore
+from chatbot.stream import StreamingStore
+
+
+def _dataset():
+    # Week 1 (2025-03-03..09): L1 struggles, L2 is perfect. Week 2: only L1 attends, nothing else is
+    # recorded. Week 3: nothing at all.
+    learners = [{"id": lid, "cohort_id": "K-1", "company_id": "K", "role": "PM", "level": "junior"} for lid in ("L1", "L2")]
+    attendance = [
+        {"learner_id": "L1", "cohort_id": "K-1", "status": "absent", "date": "2025-03-03"},
+        {"learner_id": "L2", "cohort_id": "K-1", "status": "present", "date": "2025-03-03"},
+        {"learner_id": "L1", "cohort_id": "K-1", "status": "absent", "date": "2025-03-10"},
+    ]
+    assessments = [
+        {"learner_id": "L1", "cohort_id": "K-1", "type": "quiz", "score": 30, "submitted": False, "date": "2025-03-04"},
+        {"learner_id": "L2", "cohort_id": "K-1", "type": "quiz", "score": 95, "submitted": True, "date": "2025-03-04"},
+    ]
+    satisfaction = [
+        {"learner_id": "L1", "cohort_id": "K-1", "rating": 2, "date": "2025-03-05"},
+        {"learner_id": "L2", "cohort_id": "K-1", "rating": 5, "date": "2025-03-05"},
+    ]
+    return {
+        "companies": [{"id": "K", "name": "K"}],
+        "cohorts": [{"id": "K-1", "company_id": "K", "name": "K-1", "start_at": "2025-03-03", "end_at": "2025-03-30"}],
+        "learners": learners,
+        "attendance": attendance,
+        "assessments": assessments,
+        "satisfaction": satisfaction,
+        "modules": [],
+    }
+
+
+@pytest.fixture(params=["json", "stream", "sqlite"])
+def store(request, tmp_path):
+    data = _dataset()
+    if request.param == "json":
+        return OpsStore(data)
+    if request.param == "stream":
+        return StreamingStore.from_data(data)
+    path = str(tmp_path / "weekly.db")
+    import_json(data, path)
+    return SqliteStore(path)
+
+
+def test_empty_week_reports_no_data(store):
+    res = compute_kpis_week(store, "K-1", 3)
+    assert all(res["kpis"][k] is None for k in ("attendance_rate", "assignment_completion_rate", "quiz_avg", "completion_rate", "satisfaction_avg", "nps"))
+    assert all(v is None for v in res["delta"].values())
+    report = weekly_report(store, "K", "K-1", week=3)
+    assert "출석 -, 과제 -, 퀴즈 -, 완료 -, 만족도 -, NPS -" in report
+    assert "고위험 학습자: 없음" in report
+    assert "이번 주 기록된 이벤트 없음" in report
+    assert compute_kpis_range(store, "2025-03-17", "2025-03-24")["satisfaction_avg"] is None
+
+
+def test_missing_metric_is_not_a_zero(store):
+    res = compute_kpis_week(store, "K-1", 2)
+    kpis, delta = res["kpis"], res["delta"]
+    assert kpis["attendance_rate"] == 0.0
+    assert kpis["quiz_avg"] is None and kpis["satisfaction_avg"] is None and kpis["nps"] is None
+    assert delta["attendance_rate"] == -0.5
+    assert delta["quiz_avg"] is None and delta["satisfaction_avg"] is None
+    report = weekly_report(store, "K", "K-1", week=2)
+    assert "퀴즈 -" in report and "만족도 -" in report
+    # No satisfaction rows this week, so no satisfaction follow-up either.
+    assert "체크인" not in report
+
+
+def test_learner_without_activity_is_not_ranked(store):
+    report = weekly_report(store, "K", "K-1", week=2)
+    risk_line = next(line for line in report.splitlines() if line.startswith("고위험 학습자"))
+    assert "L1" in risk_line and "L2" not in risk_line
+    # Only L1 attended, so completion is over L1 alone.
+    assert compute_kpis_week(store, "K-1", 2)["kpis"]["completion_rate"] == 0.0
+
+
+def test_whole_history_keeps_zero_for_empty_metrics():
+    data = _dataset()
+    data["satisfaction"] = []
+    report = weekly_report(OpsStore(data), "K", "K-1")
+    assert "만족도 0.0, NPS 0.0" in report
+    assert "고위험 학습자: L1(r=0.85)" in report
+
+
+def test_cohort_without_start_is_skipped_in_bulk(tmp_path, capsys):
+    from chatbot import bulk
+
+    data = _dataset()
+    data["cohorts"].append({"id": "K-2", "company_id": "K", "name": "K-2"})
+    data["cohorts"].append({"id": "K-3", "company_id": "K", "name": "K-3", "start_at": "2025-04-07"})
+    with pytest.raises(ValueError, match="start_at"):
+        weekly_report(OpsStore(data), "K", "K-2", week=1)
+    for workers in (1, 2):
+        paths = bulk.generate_all(data, "weekly", str(tmp_path / str(workers)), workers=workers, week=1)
+        assert [p.rsplit("/", 1)[-1] for p in paths] == ["weekly_K-1_w1.txt", "weekly_K-3_w1.txt"]
+        assert "K-2" in capsys.readouterr().err
+        assert bulk._DATA is None